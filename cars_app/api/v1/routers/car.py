@@ -2,9 +2,16 @@ from http import HTTPStatus
 
 from fastapi import APIRouter, Depends
 
-from cars_app.api.v1.routers.constants import CAR_PREFIX, CAR_UPDATE
+from cars_app.api.v1.routers.constants import CAR_PREFIX, CAR_TELEMETRY, CAR_UPDATE
 from cars_app.services.car import CarService, get_car_service
-from cars_app.validation.schemas import CarInfo, CarUpdate
+from cars_app.services.telemetry import TelemetryService, get_telemetry_service
+from cars_app.tracing.module import traced
+from cars_app.validation.schemas import (
+    CarInfo,
+    CarTelemetryBatch,
+    CarUpdate,
+    TelemetryAccepted,
+)
 
 router = APIRouter(
     prefix=CAR_PREFIX,
@@ -18,6 +25,7 @@ router = APIRouter(
     response_model=CarInfo,
     summary='Редактирование информации о машине',
 )
+@traced
 async def car_update(
     car_id: int,
     data: CarUpdate,
@@ -25,3 +33,18 @@ async def car_update(
 ) -> CarInfo:
     """Update specific car."""
     return await car_service.update(car_id, data)
+
+
+@router.post(
+    path=CAR_TELEMETRY,
+    status_code=HTTPStatus.ACCEPTED,
+    response_model=TelemetryAccepted,
+    summary='Прием телеметрии машин',
+)
+@traced
+async def car_telemetry(
+    data: CarTelemetryBatch,
+    telemetry_service: TelemetryService = Depends(get_telemetry_service),
+) -> TelemetryAccepted:
+    """Accepts batch of car positions, written to database on next flush."""
+    return await telemetry_service.ingest(data)
@@ -1,8 +1,9 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Header
 
 from cars_app.api.v1.routers.constants import (
+    CARGO_BATCH,
     CARGO_CREATE,
     CARGO_DELETE,
     CARGO_DETAIL,
@@ -10,13 +11,19 @@ from cars_app.api.v1.routers.constants import (
     CARGO_PREFIX,
     CARGO_UPDATE,
 )
-from cars_app.services.cargo import CargoService, get_cargo_service
+from cars_app.services.cargo import NDJSON_MEDIA_TYPE, CargoService, get_cargo_service
+from cars_app.tracing.module import traced
 from cars_app.validation.schemas import (
+    CargoBatchResult,
     CargoCreate,
+    CargoCreateBatch,
+    CargoDeleteBatch,
     CargoInfo,
     CargoInfoDetail,
     CargoListElement,
     CargoUpdate,
+    CargoUpdateBatch,
+    DetailQueryParams,
     QueryParams,
 )
 
@@ -30,27 +37,80 @@ router = APIRouter(
     path=CARGO_LIST,
     status_code=HTTPStatus.OK,
     response_model=list[CargoListElement],
+    responses={HTTPStatus.OK.value: {'content': {NDJSON_MEDIA_TYPE: {}}}},
     summary='Получение списка всех грузов',
 )
+@traced
 async def cargo_list(
     query: QueryParams = Depends(),
+    accept: str | None = Header(default=None),
     cargo_service: CargoService = Depends(get_cargo_service)
 ) -> list[CargoListElement] | None:
-    """Shows cargo's info list."""
+    """Shows cargo's info list, streams it as NDJSON if client accepts it."""
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return cargo_service.stream_list(query)
     return await cargo_service.get_list(query)
 
 
+# Batch routes are declared before `/{cargo_id}` ones, which would match their path otherwise.
+@router.post(
+    path=CARGO_BATCH,
+    status_code=HTTPStatus.MULTI_STATUS,
+    response_model=list[CargoBatchResult],
+    summary='Создание списка грузов',
+)
+@traced
+async def cargo_create_batch(
+    data: CargoCreateBatch,
+    cargo_service: CargoService = Depends(get_cargo_service),
+) -> list[CargoBatchResult]:
+    """Creates list of cargos in one transaction, reporting result of each item."""
+    return await cargo_service.create_list(data)
+
+
+@router.patch(
+    path=CARGO_BATCH,
+    status_code=HTTPStatus.MULTI_STATUS,
+    response_model=list[CargoBatchResult],
+    summary='Редактирование списка грузов',
+)
+@traced
+async def cargo_update_batch(
+    data: CargoUpdateBatch,
+    cargo_service: CargoService = Depends(get_cargo_service),
+) -> list[CargoBatchResult]:
+    """Updates list of cargos in one transaction, reporting result of each item."""
+    return await cargo_service.update_list(data)
+
+
+@router.delete(
+    path=CARGO_BATCH,
+    status_code=HTTPStatus.MULTI_STATUS,
+    response_model=list[CargoBatchResult],
+    summary='Удаление списка грузов',
+)
+@traced
+async def cargo_delete_batch(
+    cargo_ids: CargoDeleteBatch = Body(),
+    cargo_service: CargoService = Depends(get_cargo_service),
+) -> list[CargoBatchResult]:
+    """Deletes list of cargos in one transaction, reporting result of each item."""
+    return await cargo_service.delete_list(cargo_ids)
+
+
 @router.get(
     path=CARGO_DETAIL,
     status_code=HTTPStatus.OK,
     response_model=CargoInfoDetail,
     summary='Получение информации о грузе',
 )
+@traced
 async def cargo_detail(
     cargo_id: int,
+    query: DetailQueryParams = Depends(),
     cargo_service: CargoService = Depends(get_cargo_service),
 ) -> CargoInfoDetail:
-    return await cargo_service.get_detail(cargo_id)
+    return await cargo_service.get_detail(cargo_id, query)
 
 
 @router.post(
@@ -59,6 +119,7 @@ async def cargo_detail(
     response_model=CargoInfo,
     summary='Создание нового груза',
 )
+@traced
 async def cargo_create(
     data: CargoCreate,
     cargo_service: CargoService = Depends(get_cargo_service),
@@ -73,6 +134,7 @@ async def cargo_create(
     response_model=CargoInfo,
     summary='Редактирование информации о грузе',
 )
+@traced
 async def cargo_update(
     cargo_id: int,
     data: CargoUpdate,
@@ -87,6 +149,7 @@ async def cargo_update(
     status_code=HTTPStatus.NO_CONTENT,
     summary='Удаление груза',
 )
+@traced
 async def cargo_delete(
     cargo_id: int,
     cargo_service: CargoService = Depends(get_cargo_service),
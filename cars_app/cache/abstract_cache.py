@@ -17,3 +17,19 @@ class AbstractCache(ABC):
     @abstractmethod
     async def clear(self, *args, **kwargs):
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_raw(self, *args, **kwargs):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_raw(self, *args, **kwargs):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_versioned_raw(self, *args, **kwargs):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mark_stale(self, *args, **kwargs):
+        raise NotImplementedError
@@ -0,0 +1,80 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+def _default(value):
+    """Converts values unknown to fast serializers."""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    return jsonable_encoder(value)
+
+
+class JsonCodec:
+    """Standard library JSON codec."""
+
+    name = 'json'
+
+    def dumps(self, value) -> bytes:
+        return json.dumps(jsonable_encoder(value)).encode()
+
+    def loads(self, value: bytes):
+        return json.loads(value)
+
+
+class OrjsonCodec:
+    """`orjson` codec, serializes pydantic models without `jsonable_encoder`."""
+
+    name = 'orjson'
+
+    def dumps(self, value) -> bytes:
+        return orjson.dumps(value, default=_default)
+
+    def loads(self, value: bytes):
+        return orjson.loads(value)
+
+
+class MsgpackCodec:
+    """`msgpack` codec, the most compact one, but not JSON."""
+
+    name = 'msgpack'
+
+    def dumps(self, value) -> bytes:
+        return msgpack.packb(value, default=_default)
+
+    def loads(self, value: bytes):
+        return msgpack.unpackb(value)
+
+
+CODECS = {
+    JsonCodec.name: (JsonCodec, json),
+    OrjsonCodec.name: (OrjsonCodec, orjson),
+    MsgpackCodec.name: (MsgpackCodec, msgpack),
+}
+
+
+def get_codec(name: str):
+    """Returns codec instance by name. Raises `ValueError` for unknown or not installed codec."""
+    try:
+        codec_class, module = CODECS[name]
+    except KeyError:
+        raise ValueError(f'Unknown cache codec: {name!r}')
+    if module is None:
+        raise ValueError(f'Cache codec {name!r} requires `{name}` package')
+    return codec_class()
+
+
+def get_response_codec():
+    """Returns the fastest installed codec producing JSON, used for cached response bodies."""
+    return OrjsonCodec() if orjson is not None else JsonCodec()
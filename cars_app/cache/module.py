@@ -1,36 +1,159 @@
-import json
+from contextlib import contextmanager
 
 from aioredis.client import Redis
-from fastapi.encoders import jsonable_encoder
 
 from cars_app.cache.abstract_cache import AbstractCache
-from cars_app.cache.settings import EXPIRE_TIME, redis_client
+from cars_app.cache.codecs import get_codec
+from cars_app.cache.settings import (
+    CODEC,
+    EXPIRE_TIME,
+    STALE_WHILE_REVALIDATE,
+    redis_client,
+)
+from cars_app.metrics.module import CACHE_OPERATION_DURATION, CACHE_REQUESTS
+from cars_app.tracing.module import tracer
+
+CARGO_NAMESPACE = 'cargo'
+
+# Reads namespace generation and versioned value in one round trip.
+GET_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return redis.call('GET', ARGV[1] .. ':' .. generation .. ':' .. ARGV[2])
+"""
+SET_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return redis.call('SET', ARGV[1] .. ':' .. generation .. ':' .. ARGV[2], ARGV[3], 'EX', ARGV[4])
+"""
+# Same as `GET_SCRIPT`, also returns namespace version bumped by `mark_stale`.
+VERSIONED_GET_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+local version = redis.call('GET', KEYS[2]) or '0'
+return {redis.call('GET', ARGV[1] .. ':' .. generation .. ':' .. ARGV[2]), version}
+"""
+DELETE_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return redis.call('DEL', ARGV[1] .. ':' .. generation .. ':' .. ARGV[2])
+"""
 
 
 class RedisCache(AbstractCache):
-    """Cache with Redis client."""
+    """Cache with Redis client.
+
+    Keys are grouped into namespaces by their prefix (`cargo-1` belongs to
+    `cargo`) and stored with the namespace generation baked in, so clearing
+    a whole namespace is a single `INCR`. Entries of old generations are
+    never read again and age out by their TTL.
 
-    def __init__(self, cache_client: Redis) -> None:
-        """Init instance with given client."""
+    Besides generation, namespace has a version, which `mark_stale` bumps
+    without making entries unreachable. Readers of `get_versioned_raw`
+    compare it with version stored in the entry to find stale ones.
+    """
+
+    def __init__(self, cache_client: Redis, codec=None) -> None:
+        """Init instance with given client and codec, `CACHE_CODEC` one by default."""
         self.redis_client = cache_client
+        self.codec = codec or get_codec(CODEC)
+        self._get_script = cache_client.register_script(GET_SCRIPT)
+        self._set_script = cache_client.register_script(SET_SCRIPT)
+        self._delete_script = cache_client.register_script(DELETE_SCRIPT)
+        self._versioned_get_script = cache_client.register_script(VERSIONED_GET_SCRIPT)
 
     async def get(self, key: str):
         """Gets cached value."""
-        value = await self.redis_client.get(key)
-        return json.loads(value) if value else None
+        value = await self.get_raw(key)
+        return self.decode(value) if value else None
 
     async def set(self, key: str, value: str, expire_time=EXPIRE_TIME):
         """Set value to cache."""
-        value = json.dumps(jsonable_encoder(value))
-        await self.redis_client.set(key, value, expire_time)
+        await self.set_raw(key, self.encode(value), expire_time)
+
+    async def get_raw(self, key: str) -> bytes | None:
+        """Gets cached value without decoding."""
+        family = get_namespace(key)
+        with self._observe('get', family) as span:
+            value = await self._get_script(**self._script_params(key))
+            self._record_result(span, family, value)
+        return value
+
+    async def set_raw(self, key: str, value: bytes | str, expire_time=EXPIRE_TIME) -> None:
+        """Set already encoded value to cache, with `EXPIRE_TIME` if no expire time is given."""
+        params = self._script_params(key)
+        params['args'] += [value, expire_time or EXPIRE_TIME]
+        with self._observe('set', get_namespace(key)) as span:
+            span.set_attribute('cache.size', len(value))
+            await self._set_script(**params)
+
+    async def get_versioned_raw(self, key: str) -> tuple[bytes | None, int]:
+        """Gets cached value without decoding and current version of its namespace."""
+        family = get_namespace(key)
+        params = self._script_params(key)
+        params['keys'].append(self._version_key(family))
+        with self._observe('get', family) as span:
+            value, version = await self._versioned_get_script(**params)
+            self._record_result(span, family, value)
+        return value, int(version)
+
+    async def mark_stale(self, key: str) -> None:
+        """Marks values of cargo namespace stale, keeping them readable."""
+        if key == 'all':
+            await self.redis_client.incr(self._version_key(CARGO_NAMESPACE))
+
+    def encode(self, value) -> bytes:
+        """Encodes value for storing in Redis."""
+        return self.codec.dumps(value)
+
+    def decode(self, value: bytes):
+        """Decodes value read from Redis."""
+        return self.codec.loads(value)
 
     async def clear(self, key: str):
         """Clear value or values frim cache."""
-        if key == 'all':
-            async for key in self.redis_client.scan_iter('cargo-*'):
-                await self.redis_client.delete(key)
-        else:
-            await self.redis_client.delete(key)
+        family = CARGO_NAMESPACE if key == 'all' else get_namespace(key)
+        with self._observe('clear', family):
+            if key == 'all':
+                await self.redis_client.incr(self._generation_key(CARGO_NAMESPACE))
+            else:
+                await self._delete_script(**self._script_params(key))
+
+    @contextmanager
+    def _observe(self, operation: str, family: str):
+        """Times cache operation in metrics and yields span of it."""
+        with tracer.start_as_current_span(f'RedisCache.{operation}') as span:
+            span.set_attribute('cache.family', family)
+            with CACHE_OPERATION_DURATION.labels(operation, family).time():
+                yield span
+
+    def _record_result(self, span, family: str, value: bytes | None) -> None:
+        """Records cache read hit or miss."""
+        result = 'miss' if value is None else 'hit'
+        span.set_attribute('cache.result', result)
+        CACHE_REQUESTS.labels(family, result).inc()
+
+    def _script_params(self, key: str) -> dict:
+        """Returns keys and args of scripts for given cache key."""
+        namespace = get_namespace(key)
+        return {'keys': [self._generation_key(namespace)], 'args': [namespace, key]}
+
+    def _generation_key(self, namespace: str) -> str:
+        """Returns key of namespace generation counter."""
+        return f'generation:{namespace}'
+
+    def _version_key(self, namespace: str) -> str:
+        """Returns key of namespace version counter."""
+        return f'version:{namespace}'
+
+
+def get_namespace(key: str) -> str:
+    """Returns namespace of cache key, `cargo-1` belongs to `cargo`."""
+    return key.split('-', 1)[0]
+
+
+async def clear_after_fleet_move(cache: AbstractCache) -> None:
+    """Clears cargo cache after cars moved, in stale-while-revalidate mode only marks it stale."""
+    if STALE_WHILE_REVALIDATE:
+        await cache.mark_stale('all')
+    else:
+        await cache.clear('all')
 
 
 def get_redis_cache():
@@ -1,10 +1,32 @@
 import aioredis
 
-from config import REDIS_DB, REDIS_EXP, REDIS_HOST
+from config import (
+    CACHE_CODEC,
+    CACHE_LOCK_TIMEOUT,
+    CACHE_STALE_WHILE_REVALIDATE,
+    INTERVAL_SECONDS,
+    REDIS_DB,
+    REDIS_EXP,
+    REDIS_HOST,
+)
 
 redis_client = aioredis.from_url(
     f'redis://{REDIS_HOST}',
     db=REDIS_DB,
 )
 
-EXPIRE_TIME = REDIS_EXP
+# Keys of old namespace generations are never read again, so they always expire.
+DEFAULT_EXPIRE_TIME = 24 * 60 * 60
+EXPIRE_TIME = int(REDIS_EXP or DEFAULT_EXPIRE_TIME)
+CODEC = CACHE_CODEC
+LOCK_TIMEOUT = CACHE_LOCK_TIMEOUT
+
+# Stale-while-revalidate: entries are refreshed in background once older than
+# fleet relocation interval and are served until hard expiry, which outlives
+# at least one more relocation.
+STALE_WHILE_REVALIDATE = CACHE_STALE_WHILE_REVALIDATE
+SOFT_EXPIRE_TIME = INTERVAL_SECONDS
+HARD_EXPIRE_TIME = max(int(REDIS_EXP or 0), 2 * INTERVAL_SECONDS)
+
+CACHE_BACKEND_TIERED = 'tiered'
+INVALIDATION_CHANNEL = 'cache-invalidation'
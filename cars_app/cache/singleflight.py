@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from aioredis.client import Redis
+from aioredis.exceptions import LockError
+
+from cars_app.cache.settings import LOCK_TIMEOUT, redis_client
+from config import CACHE_LOCK
+
+
+class SingleFlight:
+    """Coalesces concurrent computations of the same key.
+
+    The first caller starts the computation as a task, later callers of the
+    same key await that task. With Redis client given, the computation is
+    also guarded by a Redis lock, so one worker computes and the others read
+    its result from cache once the lock is released.
+    """
+
+    def __init__(self, cache_client: Redis | None = None, lock_timeout: int = LOCK_TIMEOUT) -> None:
+        """Init `SingleFlight` instance, without Redis client coalescing is in-process only."""
+        self.redis_client = cache_client
+        self.lock_timeout = lock_timeout
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def do(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable],
+        cached: Callable[[], Awaitable] | None = None,
+    ):
+        """Returns result of `compute`, running it once for all concurrent callers of `key`.
+
+        `cached` is called after waiting for Redis lock and its result, if not None,
+        is returned instead of computing.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, compute, cached))
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Cancellation of one caller must not cancel computation shared with others.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Removes finished task, so next caller starts a new computation."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def _run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable],
+        cached: Callable[[], Awaitable] | None,
+    ):
+        """Runs computation, under Redis lock if client is given."""
+        if self.redis_client is None:
+            return await compute()
+        lock = self.redis_client.lock(
+            f'lock:{key}', timeout=self.lock_timeout, blocking_timeout=self.lock_timeout,
+        )
+        if not await lock.acquire():
+            # Lock holder is too slow, compute without it rather than fail.
+            return await compute()
+        try:
+            if cached is not None:
+                result = await cached()
+                if result is not None:
+                    return result
+            return await compute()
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                pass
+
+
+single_flight = SingleFlight(cache_client=redis_client if CACHE_LOCK else None)
+
+
+def get_single_flight():
+    """Returns `SingleFlight` instance for dependency injection."""
+    return single_flight
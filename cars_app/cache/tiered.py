@@ -0,0 +1,246 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+from aioredis.client import Redis
+
+from cars_app.cache.abstract_cache import AbstractCache
+from cars_app.cache.module import (
+    CARGO_NAMESPACE,
+    RedisCache,
+    get_namespace,
+    get_redis_cache,
+)
+from cars_app.cache.settings import (
+    CACHE_BACKEND_TIERED,
+    EXPIRE_TIME,
+    INVALIDATION_CHANNEL,
+    redis_client,
+)
+from cars_app.logging.module import logger
+from cars_app.metrics.module import TIERED_CACHE_REQUESTS
+from config import CACHE_BACKEND, LOCAL_CACHE_MAX_BYTES, LOCAL_CACHE_TTL
+
+# Delay before resubscribing after losing invalidation channel.
+RESUBSCRIBE_SECONDS = 1
+RAW_SUFFIX = '#raw'
+VERSIONED_SUFFIX = '#versioned'
+LOCAL_SUFFIXES = ('', RAW_SUFFIX, VERSIONED_SUFFIX)
+
+
+class LocalCache:
+    """In-process LRU of decoded values bounded by encoded size in bytes, with TTL."""
+
+    def __init__(self, max_bytes: int = LOCAL_CACHE_MAX_BYTES, ttl: int = LOCAL_CACHE_TTL) -> None:
+        """Init empty `LocalCache` instance."""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, object, int]] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        """Returns value if it is present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value, size: int, ttl: float | None = None) -> None:
+        """Stores value evicting least recently used ones over `max_bytes`."""
+        self.delete(key)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def delete(self, key: str) -> None:
+        """Drops value if it is present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def clear(self, namespace: str | None = None) -> None:
+        """Drops all values or values of given namespace."""
+        if namespace is None:
+            self._entries.clear()
+            self._size = 0
+            return
+        for key in [key for key in self._entries if get_namespace(key) == namespace]:
+            self.delete(key)
+
+
+class TieredCache(AbstractCache):
+    """Two-tier cache: in-process `LocalCache` in front of `RedisCache`.
+
+    Invalidations are published to Redis channel, so local tiers of all
+    workers drop entries together. Hits and misses are counted per tier
+    by `TIERED_CACHE_REQUESTS`.
+    Local tier keeps what `get`, `get_raw` and `get_versioned_raw` return
+    under separate suffixed keys.
+    """
+
+    def __init__(self, cache_client: Redis, local_cache: LocalCache | None = None) -> None:
+        """Init instance with given client."""
+        self.redis_client = cache_client
+        self.redis_cache = RedisCache(cache_client)
+        self.local_cache = local_cache or LocalCache()
+        self._instance_id = uuid.uuid4().hex
+        # Bumped on every invalidation, so values read from Redis before it are not stored locally.
+        self._epoch = 0
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, key: str):
+        """Gets cached value from local tier, then from Redis."""
+        value = self.local_cache.get(key)
+        self._record_result('local', value)
+        if value is not None:
+            return value
+
+        epoch = self._epoch
+        raw_value = await self.redis_cache.get_raw(key)
+        self._record_result('redis', raw_value)
+        if raw_value is None:
+            return None
+        value = self.redis_cache.decode(raw_value)
+        if epoch == self._epoch:
+            self.local_cache.set(key, value, len(raw_value))
+        return value
+
+    async def set(self, key: str, value, expire_time=EXPIRE_TIME):
+        """Set value to both tiers."""
+        self._drop_local(key)
+        epoch = self._epoch
+        raw_value = self.redis_cache.encode(value)
+        await self.redis_cache.set_raw(key, raw_value, expire_time)
+        if epoch == self._epoch:
+            ttl = float(expire_time) if expire_time else None
+            self.local_cache.set(key, self.redis_cache.decode(raw_value), len(raw_value), ttl)
+
+    async def get_raw(self, key: str) -> bytes | None:
+        """Gets encoded value from local tier, then from Redis."""
+        value = self.local_cache.get(key + RAW_SUFFIX)
+        self._record_result('local', value)
+        if value is not None:
+            return value
+
+        epoch = self._epoch
+        value = await self.redis_cache.get_raw(key)
+        self._record_result('redis', value)
+        if value is None:
+            return None
+        if epoch == self._epoch:
+            self.local_cache.set(key + RAW_SUFFIX, value, len(value))
+        return value
+
+    async def set_raw(self, key: str, value: bytes, expire_time=EXPIRE_TIME) -> None:
+        """Set encoded value to both tiers."""
+        self._drop_local(key)
+        epoch = self._epoch
+        await self.redis_cache.set_raw(key, value, expire_time)
+        if epoch == self._epoch:
+            ttl = float(expire_time) if expire_time else None
+            self.local_cache.set(key + RAW_SUFFIX, value, len(value), ttl)
+
+    async def get_versioned_raw(self, key: str) -> tuple[bytes | None, int]:
+        """Gets encoded value and namespace version from local tier, then from Redis."""
+        entry = self.local_cache.get(key + VERSIONED_SUFFIX)
+        self._record_result('local', entry)
+        if entry is not None:
+            return entry
+
+        epoch = self._epoch
+        value, version = await self.redis_cache.get_versioned_raw(key)
+        self._record_result('redis', value)
+        if value is None:
+            return None, version
+        if epoch == self._epoch:
+            self.local_cache.set(key + VERSIONED_SUFFIX, (value, version), len(value))
+        return value, version
+
+    async def mark_stale(self, key: str) -> None:
+        """Marks values stale in Redis and drops them from local tiers of all workers."""
+        await self.redis_cache.mark_stale(key)
+        self._invalidate(key)
+        await self.redis_client.publish(INVALIDATION_CHANNEL, f'{self._instance_id} {key}')
+
+    async def clear(self, key: str):
+        """Clear value or values from both tiers and notify other workers."""
+        await self.redis_cache.clear(key)
+        self._invalidate(key)
+        await self.redis_client.publish(INVALIDATION_CHANNEL, f'{self._instance_id} {key}')
+
+    async def start(self) -> None:
+        """Starts listening to invalidations of other workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stops listening to invalidations."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    def _record_result(self, tier: str, value) -> None:
+        """Records read hit or miss of given tier."""
+        TIERED_CACHE_REQUESTS.labels(tier, 'miss' if value is None else 'hit').inc()
+
+    def _invalidate(self, key: str) -> None:
+        """Drops local entries of given key, `all` drops cargo namespace."""
+        self._epoch += 1
+        if key == 'all':
+            self.local_cache.clear(CARGO_NAMESPACE)
+        else:
+            self._drop_local(key)
+
+    def _drop_local(self, key: str) -> None:
+        """Drops local entries of given key."""
+        for suffix in LOCAL_SUFFIXES:
+            self.local_cache.delete(key + suffix)
+
+    async def _listen(self) -> None:
+        """Applies invalidations published by other workers."""
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Messages could have been missed while unsubscribed.
+                self._epoch += 1
+                self.local_cache.clear()
+                async for message in pubsub.listen():
+                    if message['type'] != 'message':
+                        continue
+                    instance_id, key = message['data'].decode().split(' ', 1)
+                    if instance_id != self._instance_id:
+                        self._invalidate(key)
+            except asyncio.CancelledError:
+                await pubsub.close()
+                raise
+            except Exception as e:
+                logger.warning(f'Канал инвалидации кэша недоступен: {e}')
+                self._epoch += 1
+                self.local_cache.clear()
+                await pubsub.close()
+                await asyncio.sleep(RESUBSCRIBE_SECONDS)
+
+
+tiered_cache = TieredCache(cache_client=redis_client)
+
+
+def get_cache() -> AbstractCache:
+    """Returns cache configured by `CACHE_BACKEND` for dependency injection."""
+    if CACHE_BACKEND == CACHE_BACKEND_TIERED:
+        return tiered_cache
+    return get_redis_cache()
@@ -1,10 +1,14 @@
-from sqlalchemy import insert, select, update
+from sqlalchemy import Integer, bindparam, func, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cars_app.database.models import Car
+from cars_app.database.crud.copy import copy_records
+from cars_app.database.models import Car, Location
+from cars_app.tracing.module import traced_methods
 from cars_app.validation.schemas import CarCreate, CarUpdate, CarUpdateBulk
 
 
+@traced_methods
 class CarCRUD:
     """`CarCRUD` class which provides CRUD operations."""
 
@@ -18,6 +22,28 @@ class CarCRUD:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def read_fleet(self) -> list:
+        """Read id, number plate and current location with its coordinates of all cars."""
+        query = (
+            select(
+                Car.id,
+                Car.number_plate,
+                Car.current_location,
+                Location.latitude,
+                Location.longtitude,
+            )
+            .join(Location, Car.current_location == Location.zip_code)
+            .order_by(Car.id)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def read_locations(self) -> list[tuple[int, int]]:
+        """Read `(id, current_location)` of all cars."""
+        query = select(Car.id, Car.current_location)
+        result = await self.session.execute(query)
+        return result.all()
+
     async def read_first(self) -> Car | None:
         """Read first car."""
         query = select(Car)
@@ -42,6 +68,10 @@ class CarCRUD:
         )
         await self.session.commit()
 
+    async def copy_records(self, records: list[tuple], columns: list[str]) -> None:
+        """Copies records into `car` table with `COPY`, without committing."""
+        await copy_records(self.session, Car.__tablename__, records, columns)
+
     async def update(self, car_id: int, data: CarUpdate) -> Car:
         """Update specific car."""
         values = data.dict(exclude_unset=True)
@@ -62,6 +92,16 @@ class CarCRUD:
         )
         await self.session.commit()
 
+    async def update_locations(self, car_ids: list[int], zip_codes: list[int]) -> None:
+        """Sets current locations of cars with one `UPDATE` joined with unnested arrays."""
+        data = func.unnest(
+            bindparam('car_ids', car_ids, type_=ARRAY(Integer)),
+            bindparam('zip_codes', zip_codes, type_=ARRAY(Integer)),
+        ).table_valued('id', 'zip_code').render_derived(name='data')
+        stmt = update(Car).where(Car.id == data.c.id).values(current_location=data.c.zip_code)
+        await self.session.execute(stmt)
+        await self.session.commit()
+
     async def get_car_location_coordinates(self, car: Car) -> tuple[float]:
         """Returns car's current locations coordinates."""
         query = select(car.location_relation.latitude, car.location_relation.longtitude)
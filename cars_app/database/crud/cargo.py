@@ -1,23 +1,177 @@
-from sqlalchemy import insert, select, update
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from cars_app.database.models import Cargo
-from cars_app.validation.schemas import CargoCreate, CargoUpdate
+from cars_app.database.crud.copy import copy_records
+from cars_app.database.models import Car, Cargo, Location, NearbyCarsBucket
+from cars_app.geo.distance import METERS_IN_MILE, haversine_sql
+from cars_app.tracing.module import traced_methods
+from cars_app.validation.schemas import CargoCreate, CargoUpdate, CargoUpdateBulk
 
 
+@traced_methods
 class CargoCRUD:
     """`Cargo` class which provides CRUD operations."""
 
+    # Whether `earthdistance` extension is installed, checked once per process.
+    _has_earthdistance: bool | None = None
+
     def __init__(self, session: AsyncSession) -> None:
         """Init `CargoCRUD` instance with given session."""
         self.session = session
 
-    async def read_all(self, weight_min: int = 1, weight_max: int = 1000) -> list[Cargo]:
-        """Read all cargos."""
+    async def read_all(
+        self,
+        weight_min: int = 1,
+        weight_max: int = 1000,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list[Cargo]:
+        """Read all cargos ordered by `id`, or a page of them after `after_id`."""
         query = select(Cargo).where(Cargo.weight >= weight_min).where(Cargo.weight <= weight_max)
+        result = await self.session.execute(self._paginate(query, after_id, limit))
+        return result.scalars().all()
+
+    async def read_list(
+        self,
+        weight_min: int = 1,
+        weight_max: int = 1000,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Read `id`, `pickup_location` and `delivery_location` of cargos ordered by `id`."""
+        query = (
+            select(Cargo.id, Cargo.pickup_location, Cargo.delivery_location)
+            .where(Cargo.weight >= weight_min)
+            .where(Cargo.weight <= weight_max)
+        )
+        result = await self.session.execute(self._paginate(query, after_id, limit))
+        return result.all()
+
+    async def read_all_with_nearby_cars_count(
+        self,
+        weight_min: int = 1,
+        weight_max: int = 1000,
+        distance_min: int = 0,
+        distance_max: int = 450,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Read all cargos with count of cars between `distance_min` and `distance_max` miles.
+
+        Distances are great-circle ones, computed by `earthdistance` extension
+        if it is installed and by haversine expression otherwise.
+        """
+        pickup_location = aliased(Location)
+        car_location = aliased(Location)
+        if await self.has_earthdistance():
+            pickup_point = func.ll_to_earth(pickup_location.latitude, pickup_location.longtitude)
+            car_point = func.ll_to_earth(car_location.latitude, car_location.longtitude)
+            distance = func.earth_distance(pickup_point, car_point) / METERS_IN_MILE
+            in_bounding_box = car_point.op('<@')(
+                func.earth_box(pickup_point, distance_max * METERS_IN_MILE)
+            )
+        else:
+            distance = haversine_sql(
+                pickup_location.latitude, pickup_location.longtitude,
+                car_location.latitude, car_location.longtitude,
+            )
+            in_bounding_box = true()
+        nearby_cars_count = (
+            select(func.count(Car.id))
+            .select_from(Car)
+            .join(car_location, Car.current_location == car_location.zip_code)
+            .where(in_bounding_box)
+            .where(distance >= distance_min)
+            .where(distance <= distance_max)
+            .correlate(pickup_location)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                Cargo.id,
+                Cargo.pickup_location,
+                Cargo.delivery_location,
+                nearby_cars_count.label('nearby_cars_count'),
+            )
+            .join(pickup_location, Cargo.pickup_location == pickup_location.zip_code)
+            .where(Cargo.weight >= weight_min)
+            .where(Cargo.weight <= weight_max)
+        )
+        result = await self.session.execute(self._paginate(query, after_id, limit))
+        return result.all()
+
+    async def read_list_with_bucket_counts(
+        self,
+        weight_min: int = 1,
+        weight_max: int = 1000,
+        distance_min: int = 0,
+        distance_max: int = 450,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Read cargos with count of nearby cars taken from `nearby_cars_bucket` table.
+
+        Distances must be bucket edges. Count is `None` for cargos whose pickup
+        location has no bucket counts yet.
+        """
+        upper = aliased(NearbyCarsBucket)
+        lower = aliased(NearbyCarsBucket)
+        query = (
+            select(
+                Cargo.id,
+                Cargo.pickup_location,
+                Cargo.delivery_location,
+                (upper.within_count - lower.closer_count).label('nearby_cars_count'),
+            )
+            .outerjoin(
+                upper, and_(upper.zip_code == Cargo.pickup_location, upper.edge == distance_max),
+            )
+            .outerjoin(
+                lower, and_(lower.zip_code == Cargo.pickup_location, lower.edge == distance_min),
+            )
+            .where(Cargo.weight >= weight_min)
+            .where(Cargo.weight <= weight_max)
+        )
+        result = await self.session.execute(self._paginate(query, after_id, limit))
+        return result.all()
+
+    async def read_pickup_locations(self) -> list[int]:
+        """Read distinct pickup locations of all cargos."""
+        query = select(Cargo.pickup_location).distinct()
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    def _paginate(self, query, after_id: int | None, limit: int | None):
+        """Orders query by `id` and applies keyset pagination."""
+        query = query.order_by(Cargo.id)
+        if after_id is not None:
+            query = query.where(Cargo.id > after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    async def has_earthdistance(self) -> bool:
+        """Checks if `earthdistance` extension is installed."""
+        if CargoCRUD._has_earthdistance is None:
+            query = text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'earthdistance')")
+            result = await self.session.execute(query)
+            CargoCRUD._has_earthdistance = result.scalar()
+        return CargoCRUD._has_earthdistance
+
     async def get_pickup_location_coordinates(self, cargo: Cargo) -> tuple:
         """Returns cargo's pickup location coordinates."""
         query = select(cargo.pickup_location_relation)
@@ -44,6 +198,24 @@ class CargoCRUD:
         await self.session.commit()
         return result.fetchone()
 
+    async def create_list(self, data: list[CargoCreate]) -> list:
+        """Create cargos with multi-row `INSERT ... RETURNING`, rows follow order of `data`."""
+        stmt = insert(Cargo).returning(
+            Cargo.id,
+            Cargo.pickup_location,
+            Cargo.delivery_location,
+            Cargo.weight,
+            Cargo.description,
+            sort_by_parameter_order=True,
+        )
+        result = await self.session.execute(stmt, [cargo.dict() for cargo in data])
+        await self.session.commit()
+        return result.all()
+
+    async def copy_records(self, records: list[tuple], columns: list[str]) -> None:
+        """Copies records into `cargo` table with `COPY`, without committing."""
+        await copy_records(self.session, Cargo.__tablename__, records, columns)
+
     async def update(self, cargo_id: int, data: CargoUpdate) -> Cargo:
         """Update specific cargo."""
         values = data.dict(exclude_unset=True)
@@ -58,6 +230,39 @@ class CargoCRUD:
         await self.session.commit()
         return result.fetchone()
 
+    async def update_list(self, data: list[CargoUpdateBulk]) -> list:
+        """Update cargos with one `UPDATE ... RETURNING` joined with unnested arrays.
+
+        Returns rows of updated cargos, ids which do not exist are skipped.
+        """
+        rows = func.unnest(
+            bindparam('ids', [cargo.id for cargo in data], type_=ARRAY(Integer)),
+            bindparam('weights', [cargo.weight for cargo in data], type_=ARRAY(Integer)),
+            bindparam('descriptions', [cargo.description for cargo in data], type_=ARRAY(String)),
+        ).table_valued('id', 'weight', 'description').render_derived(name='data')
+        stmt = (
+            update(Cargo)
+            .where(Cargo.id == rows.c.id)
+            .values(weight=rows.c.weight, description=rows.c.description)
+            .returning(
+                Cargo.id,
+                Cargo.pickup_location,
+                Cargo.delivery_location,
+                Cargo.weight,
+                Cargo.description,
+            )
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.all()
+
+    async def delete_list(self, cargo_ids: list[int]) -> list[int]:
+        """Delete cargos with one `DELETE ... RETURNING`, returns ids of deleted ones."""
+        stmt = delete(Cargo).where(Cargo.id.in_(cargo_ids)).returning(Cargo.id)
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.scalars().all()
+
     async def delete(self, cargo_id: int):
         """Delete specific cargo."""
         cargo = await self.read(cargo_id)
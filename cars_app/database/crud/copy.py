@@ -0,0 +1,13 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def copy_records(session: AsyncSession, table: str, records: list[tuple], columns: list[str]) -> None:
+    """Copies records into `table` with `COPY` inside session transaction, without committing."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    if not driver_connection.is_in_transaction():
+        # asyncpg dialect begins transaction on first statement, `COPY` bypasses it.
+        await connection.execute(select(1))
+    await driver_connection.copy_records_to_table(table, records=records, columns=columns)
@@ -1,10 +1,13 @@
 from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cars_app.database.crud.copy import copy_records
 from cars_app.database.models import Location
+from cars_app.tracing.module import traced_methods
 from cars_app.validation.schemas import LocationCreate
 
 
+@traced_methods
 class LocationCRUD:
     """`LocationCRUD` class which provides CRUD operations."""
 
@@ -18,12 +21,30 @@ class LocationCRUD:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def read_coordinates(self) -> list[tuple[int, float, float]]:
+        """Read `(zip_code, latitude, longtitude)` of all locations."""
+        query = select(Location.zip_code, Location.latitude, Location.longtitude)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def read_zip_codes(self) -> list[int]:
+        """Read sorted zip codes of all locations."""
+        query = select(Location.zip_code).order_by(Location.zip_code)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
     async def read(self, location_zip: int) -> Location:
         """Read specific location."""
         query = select(Location).where(Location.zip_code == location_zip)
         result = await self.session.execute(query)
         return result.scalar()
 
+    async def read_existing(self, location_zips: list[int]) -> set[int]:
+        """Read which of given zip codes exist."""
+        query = select(Location.zip_code).where(Location.zip_code.in_(location_zips))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
     async def read_first(self) -> Location | None:
         """Read first location."""
         query = select(Location)
@@ -42,3 +63,7 @@ class LocationCRUD:
             insert(Location), [location.dict() for location in data]
         )
         await self.session.commit()
+
+    async def copy_records(self, records: list[tuple], columns: list[str]) -> None:
+        """Copies records into `location` table with `COPY`, without committing."""
+        await copy_records(self.session, Location.__tablename__, records, columns)
@@ -0,0 +1,85 @@
+from sqlalchemy import Integer, bindparam, delete, exists, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cars_app.database.models import Cargo, NearbyCarsBucket
+from cars_app.tracing.module import traced_methods
+
+
+@traced_methods
+class NearbyCarsBucketCRUD:
+    """`NearbyCarsBucketCRUD` class which provides CRUD operations."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Init `NearbyCarsBucketCRUD` instance with given session."""
+        self.session = session
+
+    async def read_zip_codes(self, zip_codes: list[int]) -> set[int]:
+        """Read which of given zip codes have bucket counts."""
+        query = (
+            select(NearbyCarsBucket.zip_code)
+            .where(NearbyCarsBucket.zip_code.in_(zip_codes))
+            .distinct()
+        )
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def replace(
+        self,
+        zip_codes: list[int],
+        edges: list[int],
+        within_counts: list[int],
+        closer_counts: list[int],
+    ) -> None:
+        """Upserts bucket counts and deletes ones of locations without cargos in one transaction.
+
+        Readers keep seeing previous counts until commit, so the table is never empty.
+        """
+        stmt = self._insert(zip_codes, edges, within_counts, closer_counts)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NearbyCarsBucket.zip_code, NearbyCarsBucket.edge],
+            set_={
+                'within_count': stmt.excluded.within_count,
+                'closer_count': stmt.excluded.closer_count,
+            },
+        )
+        await self.session.execute(stmt)
+        await self.session.execute(
+            delete(NearbyCarsBucket).where(
+                ~exists().where(Cargo.pickup_location == NearbyCarsBucket.zip_code),
+            )
+        )
+        await self.session.commit()
+
+    async def create_missing(
+        self,
+        zip_codes: list[int],
+        edges: list[int],
+        within_counts: list[int],
+        closer_counts: list[int],
+    ) -> None:
+        """Inserts bucket counts, keeping counts which already exist."""
+        stmt = self._insert(zip_codes, edges, within_counts, closer_counts)
+        await self.session.execute(stmt.on_conflict_do_nothing())
+        await self.session.commit()
+
+    def _insert(
+        self,
+        zip_codes: list[int],
+        edges: list[int],
+        within_counts: list[int],
+        closer_counts: list[int],
+    ):
+        """Returns `INSERT` of rows from unnested arrays."""
+        data = func.unnest(
+            bindparam('zip_codes', zip_codes, type_=ARRAY(Integer)),
+            bindparam('edges', edges, type_=ARRAY(Integer)),
+            bindparam('within_counts', within_counts, type_=ARRAY(Integer)),
+            bindparam('closer_counts', closer_counts, type_=ARRAY(Integer)),
+        ).table_valued(
+            'zip_code', 'edge', 'within_count', 'closer_count',
+        ).render_derived(name='data')
+        return insert(NearbyCarsBucket).from_select(
+            ['zip_code', 'edge', 'within_count', 'closer_count'],
+            select(data.c.zip_code, data.c.edge, data.c.within_count, data.c.closer_count),
+        )
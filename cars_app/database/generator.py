@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import string
+import time
+
+import numpy as np
+
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.cargo import CargoCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.loader import LOCATION_COLUMNS, LocationsLoader
+from cars_app.database.settings import async_session
+from cars_app.geo.snapshot import get_location_snapshot
+from cars_app.logging.module import logger
+from config import LOCATIONS_CHUNK_SIZE
+
+MAX_CARS = 100_000
+MAX_CARGOS = 1_000_000
+# Number plates match '^[1-9][0-9]{3}[A-Z]$': 9000 numbers with one of 26 letters each.
+PLATE_LETTERS = np.array(list(string.ascii_uppercase))
+PLATES_COUNT = 9000 * len(PLATE_LETTERS)
+CAR_COLUMNS = ['number_plate', 'current_location', 'capacity']
+CARGO_COLUMNS = ['pickup_location', 'delivery_location', 'weight', 'description']
+# Synthetic zip codes are out of real zip codes range, so they never collide with real locations.
+SYNTHETIC_ZIP_OFFSET = 100000
+
+
+class DataGenerator:
+    """Generates seeded synthetic locations, cars and cargos and copies them into database."""
+
+    def __init__(
+            self,
+            location_crud: LocationCRUD,
+            car_crud: CarCRUD,
+            cargo_crud: CargoCRUD,
+            seed: int = 0,
+            chunk_size: int = LOCATIONS_CHUNK_SIZE,
+    ) -> None:
+        """Inits `DataGenerator` instance."""
+        self.location_crud = location_crud
+        self.car_crud = car_crud
+        self.cargo_crud = cargo_crud
+        self.random = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+
+    async def generate_locations(self, count: int) -> np.ndarray:
+        """Copies `count` locations scattered over the USA, returns their synthetic zip codes."""
+        zip_codes = np.arange(SYNTHETIC_ZIP_OFFSET, SYNTHETIC_ZIP_OFFSET + count)
+        latitudes = self.random.uniform(25, 49, count)
+        longtitudes = self.random.uniform(-124, -67, count)
+        names = np.full(count, 'Synthetic')
+        await self._copy(
+            self.location_crud, LOCATION_COLUMNS, (zip_codes, names, names, latitudes, longtitudes),
+        )
+        return zip_codes
+
+    async def generate_cars(self, count: int, zip_codes: np.ndarray) -> None:
+        """Copies `count` cars with unique number plates located at random zip codes."""
+        if not 0 <= count <= MAX_CARS:
+            raise ValueError(f'Cars count must be between 0 and {MAX_CARS}.')
+        plates = self.random.choice(PLATES_COUNT, size=count, replace=False)
+        numbers, letters = np.divmod(plates, len(PLATE_LETTERS))
+        number_plates = np.char.add((1000 + numbers).astype(str), PLATE_LETTERS[letters])
+        await self._copy(self.car_crud, CAR_COLUMNS, (
+            number_plates,
+            self.random.choice(zip_codes, size=count),
+            self.random.integers(1, 1000, size=count, endpoint=True),
+        ))
+
+    async def generate_cargos(self, count: int, zip_codes: np.ndarray) -> None:
+        """Copies `count` cargos between random zip codes."""
+        if not 0 <= count <= MAX_CARGOS:
+            raise ValueError(f'Cargos count must be between 0 and {MAX_CARGOS}.')
+        await self._copy(self.cargo_crud, CARGO_COLUMNS, (
+            self.random.choice(zip_codes, size=count),
+            self.random.choice(zip_codes, size=count),
+            self.random.integers(1, 1000, size=count, endpoint=True),
+            np.full(count, 'Synthetic cargo'),
+        ))
+
+    async def _copy(self, crud, columns: list[str], values: tuple[np.ndarray, ...]) -> None:
+        """Copies column arrays into database in chunks, logging progress and throughput."""
+        count = len(values[0])
+        started = time.perf_counter()
+        for start in range(0, count, self.chunk_size):
+            chunk = zip(*(column[start:start + self.chunk_size].tolist() for column in values))
+            await crud.copy_records(list(chunk), columns)
+            loaded = min(start + self.chunk_size, count)
+            elapsed = time.perf_counter() - started
+            logger.info(f'Сгенерировано записей: {loaded}/{count} ({loaded / elapsed:.0f} строк/с).')
+
+
+async def main(cars: int, cargos: int, seed: int) -> None:
+    """Populates database with locations from snapshot, if needed, and generated cars and cargos."""
+    async with async_session() as session:
+        location_crud = LocationCRUD(session)
+        car_crud = CarCRUD(session)
+        if await car_crud.read_first():
+            logger.info('Машины уже загружены в БД, генерация пропущена.')
+            return
+        if not await location_crud.read_first():
+            await LocationsLoader(location_crud).load_snapshot(get_location_snapshot())
+        zip_codes = np.sort([zip_code for zip_code, *_ in await location_crud.read_coordinates()])
+        generator = DataGenerator(location_crud, car_crud, CargoCRUD(session), seed)
+        await generator.generate_cars(cars, zip_codes)
+        await generator.generate_cargos(cargos, zip_codes)
+        await session.commit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Populate database with synthetic cars and cargos.')
+    parser.add_argument('--cars', type=int, default=1000)
+    parser.add_argument('--cargos', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(main(args.cars, args.cargos, args.seed))
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import csv
+import time
+from collections.abc import AsyncIterator
+
+import aiofiles  # type: ignore
+from aiocsv import AsyncDictReader
+
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.settings import async_session
+from cars_app.geo.snapshot import LocationSnapshot
+from cars_app.logging.module import logger
+from config import LOCATIONS_CHUNK_SIZE, LOCATIONS_SOURCE
+
+LOCATION_COLUMNS = ['zip_code', 'city', 'state', 'latitude', 'longtitude']
+
+
+class LocationsLoader:
+    """Streams locations from CSV file into database with `COPY` in chunks."""
+
+    def __init__(self, location_crud: LocationCRUD, chunk_size: int = LOCATIONS_CHUNK_SIZE) -> None:
+        """Inits `LocationsLoader` instance."""
+        self.location_crud = location_crud
+        self.chunk_size = chunk_size
+
+    async def load(self, path: str = LOCATIONS_SOURCE) -> int:
+        """Loads locations from `path` in one transaction, returns count of loaded rows."""
+        return await self._copy(self._read_chunks(path))
+
+    async def load_snapshot(self, snapshot: LocationSnapshot) -> int:
+        """Loads locations from binary snapshot in one transaction, returns count of loaded rows."""
+        return await self._copy(self._read_snapshot_chunks(snapshot))
+
+    async def _copy(self, chunks: AsyncIterator[list[tuple]]) -> int:
+        """Copies chunks of records into database, logging progress and throughput."""
+        loaded = 0
+        started = time.perf_counter()
+        async for chunk in chunks:
+            await self.location_crud.copy_records(chunk, LOCATION_COLUMNS)
+            loaded += len(chunk)
+            elapsed = time.perf_counter() - started
+            logger.info(f'Загружено локаций: {loaded} ({loaded / elapsed:.0f} строк/с).')
+        await self.location_crud.session.commit()
+        return loaded
+
+    async def _read_chunks(self, path: str) -> AsyncIterator[list[tuple]]:
+        """Yields chunks of location records read from CSV file."""
+        chunk: list[tuple] = []
+        async with aiofiles.open(path, mode='r', encoding='utf-8', newline='') as file:
+            async for row in AsyncDictReader(file, quoting=csv.QUOTE_ALL):
+                chunk.append((
+                    int(row['zip']),
+                    row['city'],
+                    row['state_name'],
+                    float(row['lat']),
+                    float(row['lng']),
+                ))
+                if len(chunk) == self.chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    async def _read_snapshot_chunks(self, snapshot: LocationSnapshot) -> AsyncIterator[list[tuple]]:
+        """Yields chunks of location records read from binary snapshot."""
+        for start in range(0, len(snapshot), self.chunk_size):
+            yield snapshot.records(start, start + self.chunk_size)
+
+
+async def main(path: str, chunk_size: int) -> None:
+    """Loads locations into empty database."""
+    async with async_session() as session:
+        location_crud = LocationCRUD(session)
+        if await location_crud.read_first():
+            logger.info('Локации уже загружены в БД.')
+            return
+        await LocationsLoader(location_crud, chunk_size).load(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load locations from CSV file into database.')
+    parser.add_argument('path', nargs='?', default=LOCATIONS_SOURCE)
+    parser.add_argument('--chunk-size', type=int, default=LOCATIONS_CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.path, args.chunk_size))
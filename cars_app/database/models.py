@@ -1,4 +1,4 @@
-from sqlalchemy import CheckConstraint, Float, ForeignKey, Integer, String
+from sqlalchemy import CheckConstraint, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -8,6 +8,12 @@ class Base(DeclarativeBase):
 
 class Location(Base):
     __tablename__ = 'location'
+    __table_args__ = (
+        Index(
+            'ix_location_zip_code_coordinates', 'zip_code',
+            postgresql_include=['latitude', 'longtitude'],
+        ),
+    )
 
     zip_code: Mapped[int] = mapped_column(Integer, primary_key=True)
     city: Mapped[str] = mapped_column(String(32))
@@ -29,6 +35,16 @@ class Cargo(Base):
     __table_args__ = (
         CheckConstraint('weight >= 1', name='check_weight_min'),
         CheckConstraint('weight <= 1000', name='check_weight_max'),
+        Index(
+            'ix_cargo_weight_id', 'weight', 'id',
+            postgresql_include=['pickup_location', 'delivery_location'],
+        ),
+        Index(
+            'ix_cargo_id_list', 'id',
+            postgresql_include=['weight', 'pickup_location', 'delivery_location'],
+        ),
+        Index('ix_cargo_pickup_location', 'pickup_location'),
+        Index('ix_cargo_delivery_location', 'delivery_location'),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -54,6 +70,7 @@ class Car(Base):
         CheckConstraint('capacity >= 1', name='check_capacity_min'),
         CheckConstraint('capacity <= 1000', name='check_capacity_max'),
         CheckConstraint("number_plate ~ '^[1-9][0-9]{3}[A-Z]$'", name='check_number_plate_pattern'),
+        Index('ix_car_current_location', 'current_location', postgresql_include=['id']),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -67,3 +84,17 @@ class Car(Base):
 
     def __repr__(self) -> str:
         return f'Car(id={self.id!r})'
+
+
+class NearbyCarsBucket(Base):
+    # Counts of cars within and closer than edge distance from pickup location,
+    # cars between any two edges are `within_count` of upper minus `closer_count` of lower one.
+    __tablename__ = 'nearby_cars_bucket'
+
+    zip_code: Mapped[int] = mapped_column(ForeignKey('location.zip_code'), primary_key=True)
+    edge: Mapped[int] = mapped_column(Integer, primary_key=True)
+    within_count: Mapped[int] = mapped_column(Integer)
+    closer_count: Mapped[int] = mapped_column(Integer)
+
+    def __repr__(self) -> str:
+        return f'NearbyCarsBucket(zip_code={self.zip_code!r}, edge={self.edge!r})'
@@ -1,15 +1,105 @@
+import time
+
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 
-from config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER, SQLALCHEMY_ECHO
+from cars_app.metrics.module import POOL_CHECKOUT_WAIT, instrument_engine
+from config import (
+    DB_HOST,
+    DB_MAX_OVERFLOW,
+    DB_NAME,
+    DB_PASS,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PORT,
+    DB_REPLICA_HOST,
+    DB_REPLICA_LAG,
+    DB_REPLICA_PORT,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_USER,
+    SQLALCHEMY_ECHO,
+)
 
 SQLALCHEMY_DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+SQLALCHEMY_REPLICA_DATABASE_URL = (
+    f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}'
+)
+# Session `info` keys of replica engine and of flag set once session has written.
+REPLICA_BIND = 'replica_bind'
+HAS_WRITTEN = 'has_written'
+# Session `info` key of flag making session read from primary for a while after any write.
+READS_AFTER_WRITES = 'reads_after_writes'
+# Monotonic time until which flagged sessions read from primary, replica may lag behind till then.
+primary_reads_until = 0.0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording time spent waiting for connection checkout."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self._orig_logging_name).observe(time.perf_counter() - started)
+
+
+class RoutingSession(Session):
+    """Session sending `SELECT` statements to replica and everything else to primary.
 
+    Once session has written, its reads also go to primary, so request sees
+    its own writes regardless of replication lag. Sessions flagged with
+    `READS_AFTER_WRITES`, which fill cache, read from primary for `DB_REPLICA_LAG`
+    seconds after any session of the process has written, so writes of other
+    requests are not missed by values cached until next invalidation.
+    """
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=SQLALCHEMY_ECHO)
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """Returns replica engine for reads allowed to lag behind, primary otherwise."""
+        global primary_reads_until
+        replica = self.info.get(REPLICA_BIND)
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[HAS_WRITTEN] = True
+            primary_reads_until = time.monotonic() + DB_REPLICA_LAG
+        elif replica is not None and isinstance(clause, Select) and not self._reads_primary():
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _reads_primary(self) -> bool:
+        """Checks if reads of session go to primary."""
+        if self.info.get(HAS_WRITTEN):
+            return True
+        return bool(self.info.get(READS_AFTER_WRITES)) and time.monotonic() < primary_reads_until
+
+
+def create_engine(url: str, name: str):
+    """Creates engine with pool settings from config and instruments it."""
+    engine = create_async_engine(
+        url,
+        echo=SQLALCHEMY_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_logging_name=name,
+        connect_args={'statement_cache_size': DB_STATEMENT_CACHE_SIZE},
+    )
+    instrument_engine(engine)
+    return engine
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, 'primary')
+replica_engine = create_engine(SQLALCHEMY_REPLICA_DATABASE_URL, 'replica') if DB_REPLICA_HOST else None
 async_session = sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    info={REPLICA_BIND: replica_engine.sync_engine if replica_engine else None},
     expire_on_commit=False,
 )
 
@@ -17,3 +107,8 @@ async_session = sessionmaker(
 async def get_session():
     async with async_session() as session:
         yield session
+
+
+def get_session_factory():
+    """Returns factory of sessions outliving request for dependency injection."""
+    return async_session
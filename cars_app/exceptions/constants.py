@@ -2,3 +2,4 @@
 MSG_CARGO_NOT_FOUND = 'Cargo not found.'
 MSG_LOCATION_NOT_FOUND = 'Location with given zip_code not found.'
 MSG_CAR_NOT_FOUND = 'Car not found.'
+MSG_TELEMETRY_BUFFER_FULL = 'Telemetry buffer is full, retry later.'
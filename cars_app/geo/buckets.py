@@ -0,0 +1,26 @@
+import numpy as np
+
+from cars_app.geo.distance import distance_matrix
+from cars_app.geo.sorted_distances import CHUNK_DISTANCES
+
+
+def count_at_edges(origins, destinations, edges) -> tuple[np.ndarray, np.ndarray]:
+    """Returns counts of destinations within and closer than each edge distance from each origin.
+
+    Both arrays have `(origins, edges)` shape, count of destinations between
+    edges `i <= j` is `within[:, j] - closer[:, i]`.
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    destinations = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+    edges = np.asarray(edges, dtype=np.float64)
+    within = np.zeros((len(origins), len(edges)), dtype=np.int64)
+    closer = np.zeros((len(origins), len(edges)), dtype=np.int64)
+    if not len(destinations):
+        return within, closer
+    chunk_size = max(1, CHUNK_DISTANCES // len(destinations))
+    for start in range(0, len(origins), chunk_size):
+        distances = distance_matrix(origins[start:start + chunk_size], destinations)
+        for row, sorted_distances in enumerate(np.sort(distances, axis=1), start):
+            within[row] = np.searchsorted(sorted_distances, edges, side='right')
+            closer[row] = np.searchsorted(sorted_distances, edges, side='left')
+    return within, closer
@@ -0,0 +1,143 @@
+import numpy as np
+from sqlalchemy import func
+
+from cars_app.metrics.module import DISTANCE_COMPUTATIONS
+from config import DISTANCE_MODE
+
+HAVERSINE = 'haversine'
+ELLIPSOIDAL = 'ellipsoidal'
+
+METERS_IN_MILE = 1609.344
+EARTH_RADIUS_MILES = 3958.7613
+
+# WGS-84 ellipsoid, the same one `geopy.distance.distance` uses by default.
+WGS84_MAJOR_AXIS = 6378137.0
+WGS84_FLATTENING = 1 / 298.257223563
+WGS84_MINOR_AXIS = (1 - WGS84_FLATTENING) * WGS84_MAJOR_AXIS
+
+VINCENTY_MAX_ITERATIONS = 200
+VINCENTY_TOLERANCE = 1e-12
+
+
+def haversine(lat_1, lng_1, lat_2, lng_2) -> np.ndarray:
+    """Returns great-circle distances in miles. Arguments are broadcast against each other."""
+    lat_1, lng_1, lat_2, lng_2 = (
+        np.radians(np.asarray(x, dtype=np.float64)) for x in (lat_1, lng_1, lat_2, lng_2)
+    )
+    a = (
+        np.sin((lat_2 - lat_1) / 2) ** 2
+        + np.cos(lat_1) * np.cos(lat_2) * np.sin((lng_2 - lng_1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def ellipsoidal(lat_1, lng_1, lat_2, lng_2) -> np.ndarray:
+    """Returns WGS-84 geodesic distances in miles (Vincenty's inverse formula).
+
+    Arguments are broadcast against each other. Pairs for which the iteration
+    does not converge (nearly antipodal points) fall back to `haversine`.
+    """
+    lat_1, lng_1, lat_2, lng_2 = np.broadcast_arrays(
+        *(np.radians(np.asarray(x, dtype=np.float64)) for x in (lat_1, lng_1, lat_2, lng_2))
+    )
+    f = WGS84_FLATTENING
+    u_1 = np.arctan((1 - f) * np.tan(lat_1))
+    u_2 = np.arctan((1 - f) * np.tan(lat_2))
+    sin_u_1, cos_u_1 = np.sin(u_1), np.cos(u_1)
+    sin_u_2, cos_u_2 = np.sin(u_2), np.cos(u_2)
+    lng_diff = lng_2 - lng_1
+    lambda_ = lng_diff
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(VINCENTY_MAX_ITERATIONS):
+            sin_lambda, cos_lambda = np.sin(lambda_), np.cos(lambda_)
+            sin_sigma = np.sqrt(
+                (cos_u_2 * sin_lambda) ** 2
+                + (cos_u_1 * sin_u_2 - sin_u_1 * cos_u_2 * cos_lambda) ** 2
+            )
+            cos_sigma = sin_u_1 * sin_u_2 + cos_u_1 * cos_u_2 * cos_lambda
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_u_1 * cos_u_2 * sin_lambda / sin_sigma)
+            cos_sq_alpha = 1 - sin_alpha ** 2
+            # Equatorial lines have `cos_sq_alpha == 0`.
+            cos_2_sigma_m = np.where(
+                cos_sq_alpha == 0, 0.0, cos_sigma - 2 * sin_u_1 * sin_u_2 / cos_sq_alpha,
+            )
+            c = f / 16 * cos_sq_alpha * (4 + f * (4 - 3 * cos_sq_alpha))
+            lambda_prev = lambda_
+            lambda_ = lng_diff + (1 - c) * f * sin_alpha * (
+                sigma + c * sin_sigma * (
+                    cos_2_sigma_m + c * cos_sigma * (-1 + 2 * cos_2_sigma_m ** 2)
+                )
+            )
+            converged = np.abs(lambda_ - lambda_prev) <= VINCENTY_TOLERANCE
+            if converged.all():
+                break
+
+        u_sq = (
+            cos_sq_alpha * (WGS84_MAJOR_AXIS ** 2 - WGS84_MINOR_AXIS ** 2) / WGS84_MINOR_AXIS ** 2
+        )
+        a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = b * sin_sigma * (cos_2_sigma_m + b / 4 * (
+            cos_sigma * (-1 + 2 * cos_2_sigma_m ** 2)
+            - b / 6 * cos_2_sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2_sigma_m ** 2)
+        ))
+        miles = WGS84_MINOR_AXIS * a * (sigma - delta_sigma) / METERS_IN_MILE
+
+    if not converged.all():
+        fallback = haversine(*(np.degrees(x[~converged]) for x in (lat_1, lng_1, lat_2, lng_2)))
+        miles[~converged] = fallback
+    return miles
+
+
+DISTANCE_FUNCTIONS = {
+    HAVERSINE: haversine,
+    ELLIPSOIDAL: ellipsoidal,
+}
+
+
+def distance_matrix(origins, destinations, mode: str = DISTANCE_MODE) -> np.ndarray:
+    """Returns distances in miles between every origin and every destination.
+
+    `origins` and `destinations` are sequences of `(latitude, longitude)` pairs,
+    the result has shape `(len(origins), len(destinations))`.
+    """
+    try:
+        distance_function = DISTANCE_FUNCTIONS[mode]
+    except KeyError:
+        raise ValueError(f'Unknown distance mode: {mode!r}')
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    destinations = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+    DISTANCE_COMPUTATIONS.labels(mode).inc(len(origins) * len(destinations))
+    return distance_function(
+        origins[:, 0, None], origins[:, 1, None],
+        destinations[None, :, 0], destinations[None, :, 1],
+    )
+
+
+def distances_from(origin, destinations, mode: str = DISTANCE_MODE) -> np.ndarray:
+    """Returns distances in miles from one `(latitude, longitude)` point to every destination."""
+    return distance_matrix([origin], destinations, mode)[0]
+
+
+def nearest(distances: np.ndarray, limit: int | None = None, max_distance: float | None = None) -> np.ndarray:
+    """Returns indices of up to `limit` smallest distances within `max_distance`, sorted by distance."""
+    if max_distance is None:
+        rows = np.arange(len(distances))
+    else:
+        rows = np.flatnonzero(distances <= max_distance)
+    if limit is not None and limit < len(rows):
+        # Partial selection is linear, only selected rows are sorted afterwards.
+        rows = rows[np.argpartition(distances[rows], limit - 1)[:limit]]
+    return rows[np.argsort(distances[rows], kind='stable')]
+
+
+def haversine_sql(lat_1, lng_1, lat_2, lng_2):
+    """Returns SQL expression of great-circle distance in miles between given columns."""
+    a = (
+        func.power(func.sin(func.radians(lat_2 - lat_1) / 2), 2)
+        + func.cos(func.radians(lat_1)) * func.cos(func.radians(lat_2))
+        * func.power(func.sin(func.radians(lng_2 - lng_1) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_MILES * func.asin(func.sqrt(func.least(a, 1.0)))
@@ -0,0 +1,36 @@
+import hashlib
+
+import numpy as np
+
+
+class FleetSnapshot:
+    """Positions of all cars, read once and shared by every cargo of a request."""
+
+    def __init__(self, car_ids, number_plates, zip_codes, coordinates) -> None:
+        """Init `FleetSnapshot` instance with given columns."""
+        self.car_ids = np.asarray(car_ids, dtype=np.int64)
+        self.number_plates = list(number_plates)
+        self.zip_codes = np.asarray(zip_codes, dtype=np.int64)
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self._signature: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.car_ids)
+
+    @property
+    def signature(self) -> str:
+        """Digest of car ids and positions, changes whenever any car moves."""
+        if self._signature is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(self.car_ids.tobytes())
+            digest.update(self.coordinates.tobytes())
+            self._signature = digest.hexdigest()
+        return self._signature
+
+    @classmethod
+    def from_rows(cls, rows) -> 'FleetSnapshot':
+        """Builds snapshot from `(id, number_plate, current_location, latitude, longtitude)` rows."""
+        if not rows:
+            return cls((), (), (), ())
+        car_ids, number_plates, zip_codes, latitudes, longtitudes = zip(*rows)
+        return cls(car_ids, number_plates, zip_codes, np.column_stack((latitudes, longtitudes)))
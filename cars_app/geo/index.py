@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import numpy as np
+
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.geo.snapshot import LocationSnapshot
+from cars_app.logging.module import logger
+from config import LOCATIONS_RELOAD_INTERVAL
+
+
+class CoordinateIndex:
+    """Read-only in-memory index of location coordinates by zip code.
+
+    Zip codes are kept in a sorted `int64` array and coordinates in a contiguous
+    `(n, 2)` `float64` array of `(latitude, longtitude)` rows, so a batch of zip
+    codes is resolved with one `searchsorted` call.
+    """
+
+    def __init__(self, reload_interval: float = LOCATIONS_RELOAD_INTERVAL) -> None:
+        """Init empty `CoordinateIndex` instance."""
+        self.zip_codes = np.empty(0, dtype=np.int64)
+        self.coordinates = np.empty((0, 2), dtype=np.float64)
+        self.is_stale = True
+        self.reload_interval = reload_interval
+        self._reloaded_at = float('-inf')
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.zip_codes)
+
+    def __contains__(self, zip_code: int) -> bool:
+        row = np.searchsorted(self.zip_codes, zip_code)
+        return bool(row < len(self.zip_codes) and self.zip_codes[row] == zip_code)
+
+    def build(self, zip_codes, latitudes, longtitudes) -> None:
+        """Replaces index contents with given columns."""
+        zip_codes = np.asarray(zip_codes, dtype=np.int64)
+        order = np.argsort(zip_codes, kind='stable')
+        coordinates = np.column_stack((
+            np.asarray(latitudes, dtype=np.float64)[order],
+            np.asarray(longtitudes, dtype=np.float64)[order],
+        ))
+        zip_codes = zip_codes[order]
+        zip_codes.setflags(write=False)
+        coordinates.setflags(write=False)
+        self.zip_codes, self.coordinates = zip_codes, coordinates
+        self.is_stale = False
+
+    def load_snapshot(self, snapshot: LocationSnapshot) -> None:
+        """Replaces index contents with memory-mapped snapshot columns without copying them."""
+        self.zip_codes, self.coordinates = snapshot.zip_codes, snapshot.coordinates
+        self.is_stale = False
+        logger.info(f'Индекс координат загружен из снимка: {len(self)} локаций.')
+
+    async def load(self, location_crud: LocationCRUD) -> None:
+        """Loads index from database."""
+        async with self._lock:
+            rows = await location_crud.read_coordinates()
+            self.build(*(zip(*rows) if rows else ((), (), ())))
+        logger.info(f'Индекс координат загружен: {len(self)} локаций.')
+
+    async def ensure_loaded(self, location_crud: LocationCRUD) -> None:
+        """Loads index if it was never loaded or locations were changed."""
+        if self.is_stale:
+            await self.load(location_crud)
+
+    def invalidate(self) -> None:
+        """Marks index as stale, so it is reloaded on next use."""
+        self.is_stale = True
+
+    def rows(self, zip_codes) -> np.ndarray:
+        """Returns index rows of given zip codes. Raises `KeyError` for unknown zip codes."""
+        zip_codes = np.asarray(zip_codes, dtype=np.int64)
+        rows = np.searchsorted(self.zip_codes, zip_codes)
+        found = rows < len(self.zip_codes)
+        found[found] = self.zip_codes[rows[found]] == zip_codes[found]
+        if not found.all():
+            raise KeyError(zip_codes[~found].tolist())
+        return rows
+
+    def lookup(self, zip_codes) -> np.ndarray:
+        """Returns `(latitude, longtitude)` array for given zip codes."""
+        return self.coordinates[self.rows(zip_codes)]
+
+    async def lookup_loaded(self, zip_codes, location_crud: LocationCRUD) -> np.ndarray:
+        """Same as `lookup`, loads index first and reloads it once for unknown zip codes.
+
+        Unknown zip codes reload index at most once per `reload_interval` seconds,
+        so requests with them can not keep reloading the whole table.
+        """
+        await self.ensure_loaded(location_crud)
+        try:
+            return self.lookup(zip_codes)
+        except KeyError:
+            if time.monotonic() - self._reloaded_at < self.reload_interval:
+                raise
+        # Locations may have been added by another process, reload once before giving up.
+        # Reload time is taken before loading, so concurrent misses do not reload again.
+        self._reloaded_at = time.monotonic()
+        await self.load(location_crud)
+        return self.lookup(zip_codes)
+
+
+coordinate_index = CoordinateIndex()
+
+
+def get_coordinate_index():
+    """Returns `CoordinateIndex` instance for dependency injection."""
+    return coordinate_index
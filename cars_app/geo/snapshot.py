@@ -0,0 +1,150 @@
+import argparse
+import csv
+import fcntl
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+from cars_app.logging.module import logger
+from config import LOCATIONS_SNAPSHOT, LOCATIONS_SOURCE
+
+SNAPSHOT_COLUMNS = ('zip_codes', 'coordinates', 'city_codes', 'state_codes', 'cities', 'states')
+
+
+class LocationSnapshot:
+    """Columnar snapshot of locations dataset, stored as `.npy` files and memory-mapped on load.
+
+    Rows are sorted by zip code. City and state names are interned: rows keep codes
+    pointing into tables of unique names, so every column has a fixed width and
+    pages are shared between workers mapping the same files.
+    """
+
+    def __init__(self, zip_codes, coordinates, city_codes, state_codes, cities, states) -> None:
+        """Init `LocationSnapshot` instance with given columns."""
+        self.zip_codes = zip_codes
+        self.coordinates = coordinates
+        self.city_codes = city_codes
+        self.state_codes = state_codes
+        self.cities = cities
+        self.states = states
+
+    def __len__(self) -> int:
+        return len(self.zip_codes)
+
+    def records(self, start: int = 0, stop: int | None = None) -> list[tuple]:
+        """Returns `(zip_code, city, state, latitude, longtitude)` tuples of given rows."""
+        rows = slice(start, stop)
+        return list(zip(
+            self.zip_codes[rows].tolist(),
+            self.cities[self.city_codes[rows]].tolist(),
+            self.states[self.state_codes[rows]].tolist(),
+            self.coordinates[rows, 0].tolist(),
+            self.coordinates[rows, 1].tolist(),
+        ))
+
+    @classmethod
+    def from_csv(cls, path: str = LOCATIONS_SOURCE) -> 'LocationSnapshot':
+        """Builds snapshot from 'uszips.csv' formatted file."""
+        with open(path, mode='r', encoding='utf-8', newline='') as file:
+            rows = [
+                (int(row['zip']), float(row['lat']), float(row['lng']), row['city'], row['state_name'])
+                for row in csv.DictReader(file, quoting=csv.QUOTE_ALL)
+            ]
+        rows.sort()
+        zip_codes, latitudes, longtitudes, city_names, state_names = zip(*rows) if rows else ((),) * 5
+        cities, city_codes = np.unique(np.array(city_names, dtype=str), return_inverse=True)
+        states, state_codes = np.unique(np.array(state_names, dtype=str), return_inverse=True)
+        return cls(
+            np.asarray(zip_codes, dtype=np.int64),
+            np.column_stack((latitudes, longtitudes)).astype(np.float64).reshape(-1, 2),
+            city_codes.astype(np.int32),
+            state_codes.astype(np.int16),
+            cities,
+            states,
+        )
+
+    @classmethod
+    def load(cls, directory: str = LOCATIONS_SNAPSHOT) -> 'LocationSnapshot':
+        """Memory-maps snapshot columns from `directory`."""
+        # Mapped columns stay readable after snapshot is replaced, only mapping has to be locked.
+        with snapshot_lock(directory, shared=True):
+            return cls(*(
+                np.load(os.path.join(directory, f'{column}.npy'), mmap_mode='r')
+                for column in SNAPSHOT_COLUMNS
+            ))
+
+    def save(self, directory: str = LOCATIONS_SNAPSHOT) -> None:
+        """Writes snapshot columns into `directory`, replacing existing snapshot.
+
+        Caller holds exclusive `snapshot_lock` of `directory`.
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        temp_directory = tempfile.mkdtemp(dir=parent)
+        for column in SNAPSHOT_COLUMNS:
+            np.save(os.path.join(temp_directory, f'{column}.npy'), getattr(self, column))
+        # Complete snapshot is moved into place, so readers never see partially written columns.
+        shutil.rmtree(directory, ignore_errors=True)
+        os.rename(temp_directory, directory)
+
+
+@contextmanager
+def snapshot_lock(directory: str = LOCATIONS_SNAPSHOT, shared: bool = False):
+    """Holds lock file next to snapshot `directory`, exclusive one while snapshot is replaced."""
+    path = f'{os.path.abspath(directory)}.lock'
+    with open(path, mode='a') as file:
+        fcntl.flock(file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def is_snapshot_fresh(path: str = LOCATIONS_SOURCE, directory: str = LOCATIONS_SNAPSHOT) -> bool:
+    """Checks if snapshot exists and is not older than source file."""
+    snapshot_file = os.path.join(directory, f'{SNAPSHOT_COLUMNS[-1]}.npy')
+    if not os.path.exists(snapshot_file):
+        return False
+    return not os.path.exists(path) or os.path.getmtime(snapshot_file) >= os.path.getmtime(path)
+
+
+def is_snapshot_available(path: str = LOCATIONS_SOURCE, directory: str = LOCATIONS_SNAPSHOT) -> bool:
+    """Checks if snapshot exists or can be built from source file."""
+    return os.path.exists(path) or is_snapshot_fresh(path, directory)
+
+
+def ensure_snapshot(path: str = LOCATIONS_SOURCE, directory: str = LOCATIONS_SNAPSHOT) -> LocationSnapshot:
+    """Loads snapshot, converting source file first if snapshot is missing or outdated.
+
+    Workers starting together build snapshot once, the rest wait for it.
+    """
+    if not is_snapshot_fresh(path, directory):
+        with snapshot_lock(directory):
+            # Snapshot could have been built by another worker while this one waited for lock.
+            if not is_snapshot_fresh(path, directory):
+                LocationSnapshot.from_csv(path).save(directory)
+                logger.info(f'Снимок локаций сохранен в {directory}.')
+    return LocationSnapshot.load(directory)
+
+
+location_snapshot: LocationSnapshot | None = None
+
+
+def get_location_snapshot() -> LocationSnapshot:
+    """Returns memory-mapped `LocationSnapshot` instance, loaded on first call."""
+    global location_snapshot
+    if location_snapshot is None:
+        location_snapshot = ensure_snapshot()
+    return location_snapshot
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert locations CSV file into binary snapshot.')
+    parser.add_argument('path', nargs='?', default=LOCATIONS_SOURCE)
+    parser.add_argument('directory', nargs='?', default=LOCATIONS_SNAPSHOT)
+    args = parser.parse_args()
+    with snapshot_lock(args.directory):
+        LocationSnapshot.from_csv(args.path).save(args.directory)
+    logger.info(f'Снимок локаций сохранен в {args.directory}.')
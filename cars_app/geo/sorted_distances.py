@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from cars_app.geo.distance import distance_matrix
+from cars_app.geo.fleet import FleetSnapshot
+from config import DISTANCE_CACHE_MAX_BYTES
+
+# Upper bound of distances computed at once, keeps temporary arrays small.
+CHUNK_DISTANCES = 1_000_000
+
+
+class SortedDistanceCache:
+    """Sorted distances from pickup locations to every car of the fleet.
+
+    With a sorted array, count of cars in any `distance_min`/`distance_max`
+    window is two binary searches. Arrays are kept per pickup zip code in an
+    LRU bounded by `max_bytes` and all of them are dropped once the fleet moves.
+    """
+
+    def __init__(self, max_bytes: int = DISTANCE_CACHE_MAX_BYTES) -> None:
+        """Init empty `SortedDistanceCache` instance."""
+        self.max_bytes = max_bytes
+        self.fleet_signature: str | None = None
+        self._entries: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def fits(self, fleet: FleetSnapshot, locations_count: int) -> bool:
+        """Checks if arrays for given number of locations fit into cache."""
+        return len(fleet) * np.dtype(np.float64).itemsize * locations_count <= self.max_bytes
+
+    def get(self, fleet: FleetSnapshot, zip_codes, coordinates) -> list[np.ndarray]:
+        """Returns sorted distances for each of given locations, computing missing ones."""
+        if fleet.signature != self.fleet_signature:
+            self.clear()
+            self.fleet_signature = fleet.signature
+        zip_codes = [int(zip_code) for zip_code in zip_codes]
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        result: dict[int, np.ndarray] = {}
+        missing = []
+        for row, zip_code in enumerate(zip_codes):
+            if zip_code in self._entries:
+                self._entries.move_to_end(zip_code)
+                result[zip_code] = self._entries[zip_code]
+            elif zip_code not in result:
+                missing.append(row)
+        chunk_size = max(1, CHUNK_DISTANCES // max(1, len(fleet)))
+        for start in range(0, len(missing), chunk_size):
+            rows = missing[start:start + chunk_size]
+            distances = np.sort(distance_matrix(coordinates[rows], fleet.coordinates), axis=1)
+            for row, sorted_distances in zip(rows, distances):
+                result[zip_codes[row]] = sorted_distances
+                self._put(zip_codes[row], sorted_distances)
+        return [result[zip_code] for zip_code in zip_codes]
+
+    def count(
+        self,
+        fleet: FleetSnapshot,
+        zip_codes,
+        coordinates,
+        distance_min: float,
+        distance_max: float,
+    ) -> np.ndarray:
+        """Returns counts of cars between `distance_min` and `distance_max` miles from locations."""
+        return np.array([
+            np.searchsorted(distances, distance_max, side='right')
+            - np.searchsorted(distances, distance_min, side='left')
+            for distances in self.get(fleet, zip_codes, coordinates)
+        ], dtype=np.int64)
+
+    def clear(self) -> None:
+        """Drops all arrays."""
+        self._entries.clear()
+        self._size = 0
+
+    def _put(self, zip_code: int, sorted_distances: np.ndarray) -> None:
+        """Stores array evicting least recently used ones over `max_bytes`."""
+        if sorted_distances.nbytes > self.max_bytes:
+            return
+        self._entries[zip_code] = sorted_distances
+        self._size += sorted_distances.nbytes
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.nbytes
+
+
+sorted_distance_cache = SortedDistanceCache()
+
+
+def get_sorted_distance_cache():
+    """Returns `SortedDistanceCache` instance for dependency injection."""
+    return sorted_distance_cache
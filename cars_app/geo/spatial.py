@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+from cars_app.geo.distance import EARTH_RADIUS_MILES, distances_from
+
+CELL_DEGREES = 1.0
+# Spherical bounds are widened to stay a superset of ellipsoidal distances.
+SEARCH_MARGIN = 1.01
+
+
+class FleetIndex:
+    """Grid bucket index of car positions for distance range queries.
+
+    Cars are bucketed into `CELL_DEGREES` latitude/longtitude cells and kept
+    sorted by cell key, so candidates around a point are a few contiguous
+    slices. Exact distances are computed only for candidates.
+    """
+
+    def __init__(self, cell_degrees: float = CELL_DEGREES) -> None:
+        """Init empty `FleetIndex` instance."""
+        self.cell_degrees = cell_degrees
+        self.lat_cells = math.ceil(180 / cell_degrees)
+        self.lng_cells = math.ceil(360 / cell_degrees)
+        self.car_ids = np.empty(0, dtype=np.int64)
+        self.coordinates = np.empty((0, 2), dtype=np.float64)
+        self._cell_keys = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._is_sorted = True
+
+    def __len__(self) -> int:
+        return len(self.car_ids)
+
+    def sync(self, car_ids, coordinates) -> None:
+        """Brings index up to date with given fleet positions.
+
+        Only moved cars are re-bucketed when the set of cars is unchanged,
+        otherwise the index is rebuilt.
+        """
+        car_ids = np.asarray(car_ids, dtype=np.int64)
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        order = np.argsort(car_ids, kind='stable')
+        car_ids, coordinates = car_ids[order], coordinates[order]
+        if not np.array_equal(car_ids, self.car_ids):
+            self.rebuild(car_ids, coordinates)
+            return
+        moved = np.flatnonzero((coordinates != self.coordinates).any(axis=1))
+        if len(moved):
+            self.coordinates[moved] = coordinates[moved]
+            self._cell_keys[moved] = self._get_cell_keys(coordinates[moved])
+            self._is_sorted = False
+
+    def rebuild(self, car_ids, coordinates) -> None:
+        """Replaces index contents with given fleet positions."""
+        self.car_ids = np.asarray(car_ids, dtype=np.int64).copy()
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2).copy()
+        self._cell_keys = self._get_cell_keys(self.coordinates)
+        self._is_sorted = False
+
+    def move(self, car_id: int, latitude: float, longtitude: float) -> None:
+        """Moves single car. Raises `KeyError` for unknown car."""
+        row = np.searchsorted(self.car_ids, car_id)
+        if row >= len(self.car_ids) or self.car_ids[row] != car_id:
+            raise KeyError(car_id)
+        self.coordinates[row] = (latitude, longtitude)
+        self._cell_keys[row] = self._get_cell_keys(self.coordinates[row:row + 1])[0]
+        self._is_sorted = False
+
+    def query(
+        self,
+        latitude: float,
+        longtitude: float,
+        distance_min: float,
+        distance_max: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns rows of cars between `distance_min` and `distance_max` miles and their distances."""
+        rows = self._get_candidate_rows(latitude, longtitude, distance_max)
+        distances = distances_from((latitude, longtitude), self.coordinates[rows])
+        within = (distances >= distance_min) & (distances <= distance_max)
+        return rows[within], distances[within]
+
+    def count(self, origins, distance_min: float, distance_max: float) -> np.ndarray:
+        """Returns counts of cars between `distance_min` and `distance_max` miles from origins."""
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        if not len(origins) or not len(self):
+            return np.zeros(len(origins), dtype=np.int64)
+        unique_origins, inverse = np.unique(origins, axis=0, return_inverse=True)
+        counts = np.array([
+            len(self.query(latitude, longtitude, distance_min, distance_max)[0])
+            for latitude, longtitude in unique_origins
+        ], dtype=np.int64)
+        return counts[inverse.reshape(-1)]
+
+    def _get_cell_keys(self, coordinates: np.ndarray) -> np.ndarray:
+        """Returns grid cell keys of given coordinates."""
+        lat_cells = np.floor((coordinates[:, 0] + 90) / self.cell_degrees).astype(np.int64)
+        lng_cells = np.floor((coordinates[:, 1] + 180) / self.cell_degrees).astype(np.int64)
+        lat_cells = np.clip(lat_cells, 0, self.lat_cells - 1)
+        lng_cells = lng_cells % self.lng_cells
+        return lat_cells * self.lng_cells + lng_cells
+
+    def _sort(self) -> None:
+        """Sorts cars by cell key after rebuild or moves."""
+        if not self._is_sorted:
+            self._order = np.argsort(self._cell_keys, kind='stable')
+            self._sorted_keys = self._cell_keys[self._order]
+            self._is_sorted = True
+
+    def _get_candidate_rows(self, latitude: float, longtitude: float, radius: float) -> np.ndarray:
+        """Returns rows of cars in cells which may be within `radius` miles from given point."""
+        self._sort()
+        delta = math.degrees(radius * SEARCH_MARGIN / EARTH_RADIUS_MILES)
+        lat_low, lat_high = latitude - delta, latitude + delta
+        if lat_low <= -90 or lat_high >= 90 or delta >= 90:
+            return np.arange(len(self), dtype=np.int64)
+
+        ratio = math.sin(math.radians(delta)) / math.cos(math.radians(latitude))
+        lng_ranges = [(0, self.lng_cells - 1)]
+        if ratio < 1:
+            lng_delta = math.degrees(math.asin(ratio))
+            low = math.floor((longtitude - lng_delta + 180) / self.cell_degrees)
+            high = math.floor((longtitude + lng_delta + 180) / self.cell_degrees)
+            if high - low + 1 < self.lng_cells:
+                if low < 0:
+                    lng_ranges = [(low + self.lng_cells, self.lng_cells - 1), (0, high)]
+                elif high >= self.lng_cells:
+                    lng_ranges = [(low, self.lng_cells - 1), (0, high - self.lng_cells)]
+                else:
+                    lng_ranges = [(low, high)]
+
+        lat_rows = np.arange(
+            math.floor((lat_low + 90) / self.cell_degrees),
+            min(math.floor((lat_high + 90) / self.cell_degrees), self.lat_cells - 1) + 1,
+            dtype=np.int64,
+        ) * self.lng_cells
+        starts = np.concatenate([lat_rows + low for low, _ in lng_ranges])
+        ends = np.concatenate([lat_rows + high + 1 for _, high in lng_ranges])
+        lefts = np.searchsorted(self._sorted_keys, starts)
+        rights = np.searchsorted(self._sorted_keys, ends)
+        slices = [self._order[left:right] for left, right in zip(lefts, rights)]
+        return np.concatenate(slices + [np.empty(0, dtype=np.int64)])
+
+
+fleet_index = FleetIndex()
+
+
+def get_fleet_index():
+    """Returns `FleetIndex` instance for dependency injection."""
+    return fleet_index
@@ -4,9 +4,15 @@ from fastapi import FastAPI
 
 from cars_app.api.v1.routers.car import router as car_router
 from cars_app.api.v1.routers.cargo import router as cargo_router
+from cars_app.cache.settings import CACHE_BACKEND_TIERED
+from cars_app.cache.tiered import get_cache, tiered_cache
 from cars_app.database.settings import async_session
+from cars_app.logging.module import logger
+from cars_app.metrics.module import metrics, observe_request
 from cars_app.services.helper import get_helper_service
-from config import INTERVAL_SECONDS
+from cars_app.services.telemetry import get_telemetry_service, telemetry_buffer
+from cars_app.tracing.module import configure_tracing, trace_request
+from config import CACHE_BACKEND, INTERVAL_SECONDS, TELEMETRY_FLUSH_INTERVAL
 
 app = FastAPI(
     title='Cars API',
@@ -17,6 +23,10 @@ app = FastAPI(
 )
 app.include_router(cargo_router)
 app.include_router(car_router)
+app.middleware('http')(observe_request)
+app.middleware('http')(trace_request)
+configure_tracing()
+app.add_api_route('/metrics', metrics, include_in_schema=False)
 
 
 async def populate_db():
@@ -24,7 +34,9 @@ async def populate_db():
     async with async_session() as session:
         helper_service = get_helper_service(session)
         await helper_service.populate_locations()
+        await helper_service.load_coordinate_index()
         await helper_service.populate_cars()
+        await helper_service.refresh_nearby_cars_buckets()
 
 
 async def update_cars_locations_random():
@@ -36,8 +48,34 @@ async def update_cars_locations_random():
             await helper_service.update_locations_random()
 
 
+async def flush_telemetry():
+    """Writes car telemetry buffered since previous flush."""
+    async with async_session() as session:
+        telemetry_service = get_telemetry_service(session, get_cache(), telemetry_buffer)
+        await telemetry_service.flush()
+
+
+async def flush_telemetry_periodically():
+    """Flushes car telemetry every 'TELEMETRY_FLUSH_INTERVAL' seconds."""
+    while True:
+        await asyncio.sleep(TELEMETRY_FLUSH_INTERVAL)
+        try:
+            await flush_telemetry()
+        except Exception as e:
+            logger.warning(f'Не удалось сбросить телеметрию машин: {e}')
+
+
 @app.on_event('startup')
 async def startup_event():
     loop = asyncio.get_event_loop()
+    if CACHE_BACKEND == CACHE_BACKEND_TIERED:
+        await tiered_cache.start()
     await populate_db()
     loop.create_task(update_cars_locations_random())
+    loop.create_task(flush_telemetry_periodically())
+
+
+@app.on_event('shutdown')
+async def shutdown_event():
+    await flush_telemetry()
+    await tiered_cache.stop()
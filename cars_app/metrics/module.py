@@ -0,0 +1,115 @@
+import time
+from contextvars import ContextVar
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route.',
+    ['method', 'route', 'status'],
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    'http_request_sql_statements',
+    'SQL statements executed per HTTP request.',
+    ['method', 'route'],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+REQUEST_SQL_DURATION = Histogram(
+    'http_request_sql_duration_seconds',
+    'Total duration of SQL statements per HTTP request.',
+    ['method', 'route'],
+)
+SQL_STATEMENT_DURATION = Histogram(
+    'sql_statement_duration_seconds',
+    'Duration of SQL statements.',
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting for connection from pool.',
+    ['engine'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+CACHE_OPERATION_DURATION = Histogram(
+    'cache_operation_duration_seconds',
+    'Latency of cache operations by key family.',
+    ['operation', 'family'],
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Cache reads by key family and result.',
+    ['family', 'result'],
+)
+TIERED_CACHE_REQUESTS = Counter(
+    'tiered_cache_requests_total',
+    'Tiered cache reads by tier and result.',
+    ['tier', 'result'],
+)
+DISTANCE_COMPUTATIONS = Counter(
+    'distance_computations_total',
+    'Computed point-to-point distances by distance mode.',
+    ['mode'],
+)
+DISTANCE_DURATION = Histogram(
+    'distance_computation_duration_seconds',
+    'Duration of nearby cars counting and distances to cars in cargo service.',
+    ['method'],
+)
+TELEMETRY_UPDATES = Counter(
+    'telemetry_updates_total',
+    'Car position updates received by telemetry endpoint by result.',
+    ['result'],
+)
+JOB_DURATION = Histogram(
+    'background_job_duration_seconds',
+    'Duration of background jobs.',
+    ['job'],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+# Statements count and duration of current request, filled by engine events.
+request_sql_stats: ContextVar[dict | None] = ContextVar('request_sql_stats', default=None)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Records duration of every SQL statement executed by `engine`."""
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['query_started'].pop()
+        SQL_STATEMENT_DURATION.observe(duration)
+        stats = request_sql_stats.get()
+        if stats is not None:
+            stats['count'] += 1
+            stats['duration'] += duration
+
+
+async def observe_request(request: Request, call_next) -> Response:
+    """Middleware recording latency and SQL statements of request by its route template."""
+    stats = {'count': 0, 'duration': 0.0}
+    token = request_sql_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_sql_stats.reset(token)
+    route = request.scope.get('route')
+    # Unmatched paths are not labeled with raw path to keep labels cardinality bounded.
+    path = route.path if route else 'unmatched'
+    REQUEST_LATENCY.labels(request.method, path, response.status_code).observe(
+        time.perf_counter() - started,
+    )
+    REQUEST_SQL_STATEMENTS.labels(request.method, path).observe(stats['count'])
+    REQUEST_SQL_DURATION.labels(request.method, path).observe(stats['duration'])
+    return response
+
+
+def metrics(request: Request) -> Response:
+    """Returns metrics in Prometheus text format."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -5,13 +5,18 @@ from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cars_app.cache.abstract_cache import AbstractCache
-from cars_app.cache.module import get_redis_cache
+from cars_app.cache.module import clear_after_fleet_move
+from cars_app.cache.tiered import get_cache
 from cars_app.database.crud.car import CarCRUD
 from cars_app.database.settings import get_session
 from cars_app.exceptions.constants import MSG_CAR_NOT_FOUND, MSG_LOCATION_NOT_FOUND
+from cars_app.services.nearby_cars import NEARBY_CARS_BACKEND_BUCKETS, schedule_refresh
+from cars_app.tracing.module import traced_methods
 from cars_app.validation.schemas import CarInfo, CarUpdate
+from config import NEARBY_CARS_BACKEND
 
 
+@traced_methods
 class CarService:
     def __init__(
         self,
@@ -26,7 +31,10 @@ class CarService:
         """Update specific car."""
         try:
             updated_car = await self.car_crud.update(car_id, data)
-            await self.cache.clear('all')
+            await clear_after_fleet_move(self.cache)
+            if NEARBY_CARS_BACKEND == NEARBY_CARS_BACKEND_BUCKETS:
+                # Single car move does not wait for counts of every pickup location.
+                schedule_refresh(self.cache)
             return updated_car
         except NoResultFound:
             raise HTTPException(
@@ -45,7 +53,7 @@ class CarService:
 
 def get_car_service(
         session: AsyncSession = Depends(get_session),
-        cache: AbstractCache = Depends(get_redis_cache),
+        cache: AbstractCache = Depends(get_cache),
 ):
     """Returns `CarService` instance."""
     car_crud = CarCRUD(session)
@@ -1,29 +1,78 @@
+import asyncio
+import struct
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from http import HTTPStatus
 
-from fastapi import Depends, HTTPException
-from geopy.distance import distance
+import numpy as np
+from fastapi import Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cars_app.cache.abstract_cache import AbstractCache
-from cars_app.cache.module import get_redis_cache
+from cars_app.cache.codecs import get_response_codec
+from cars_app.cache.settings import (
+    HARD_EXPIRE_TIME,
+    SOFT_EXPIRE_TIME,
+    STALE_WHILE_REVALIDATE,
+)
+from cars_app.cache.singleflight import SingleFlight, get_single_flight
+from cars_app.cache.tiered import get_cache
 from cars_app.database.crud.car import CarCRUD
 from cars_app.database.crud.cargo import CargoCRUD
 from cars_app.database.crud.location import LocationCRUD
-from cars_app.database.models import Car, Cargo, Location
-from cars_app.database.settings import get_session
+from cars_app.database.models import Cargo
+from cars_app.database.settings import (
+    READS_AFTER_WRITES,
+    async_session,
+    get_session,
+    get_session_factory,
+)
 from cars_app.exceptions.constants import MSG_CARGO_NOT_FOUND, MSG_LOCATION_NOT_FOUND
+from cars_app.geo.distance import distances_from, nearest
+from cars_app.geo.fleet import FleetSnapshot
+from cars_app.geo.index import CoordinateIndex, get_coordinate_index
+from cars_app.geo.sorted_distances import SortedDistanceCache, get_sorted_distance_cache
+from cars_app.geo.spatial import FleetIndex, get_fleet_index
+from cars_app.logging.module import logger
+from cars_app.metrics.module import DISTANCE_DURATION
+from cars_app.services.nearby_cars import (
+    NEARBY_CARS_BACKEND_BUCKETS,
+    NearbyCarsBucketService,
+    get_nearby_cars_bucket_service,
+    schedule_refresh,
+)
+from cars_app.tracing.module import traced, traced_methods
 from cars_app.validation.schemas import (
+    CargoBatchResult,
     CargoCarsInfo,
     CargoCreate,
     CargoInfo,
     CargoInfoDetail,
     CargoListElement,
     CargoUpdate,
+    CargoUpdateBulk,
+    DetailQueryParams,
     QueryParams,
 )
+from config import NEARBY_CARS_BACKEND
+
+NEARBY_CARS_BACKEND_SQL = 'sql'
+JSON_MEDIA_TYPE = 'application/json'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 500
+# Soft expiry timestamp and namespace version prepended to stale-while-revalidate entries.
+STALE_HEADER = struct.Struct('!dq')
 
+Builder = Callable[['CargoService'], Awaitable]
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+# Keeps references to background refreshes until they finish.
+background_tasks: set[asyncio.Task] = set()
 
+
+@traced_methods
 class CargoService:
     def __init__(
         self,
@@ -31,67 +80,47 @@ class CargoService:
         car_crud: CarCRUD,
         location_crud: LocationCRUD,
         cache: AbstractCache,
+        coordinate_index: CoordinateIndex,
+        fleet_index: FleetIndex,
+        sorted_distance_cache: SortedDistanceCache,
+        single_flight: SingleFlight,
+        nearby_cars_buckets: NearbyCarsBucketService,
+        session_factory: SessionFactory = async_session,
     ) -> None:
         """Init `CargoService` instance."""
         self.cargo_crud = cargo_crud
         self.car_crud = car_crud
         self.location_crud = location_crud
         self.cache = cache
+        self.coordinate_index = coordinate_index
+        self.fleet_index = fleet_index
+        self.sorted_distance_cache = sorted_distance_cache
+        self.single_flight = single_flight
+        self.nearby_cars_buckets = nearby_cars_buckets
+        self.session_factory = session_factory
+        self.response_codec = get_response_codec()
+        self._fleet: FleetSnapshot | None = None
 
-    async def get_list(self, query: QueryParams) -> list[CargoListElement]:
+    async def get_list(self, query: QueryParams) -> Response:
         """Gets list of cargos and returns serialized response."""
-        cache_key = f'cargo-{query}'
-        serialized_cargos = await self.cache.get(cache_key)
-        if not serialized_cargos:
-            cargos = await self.cargo_crud.read_all(query.weight_min, query.weight_max)
-            serialized_cargos = [
-                CargoListElement(
-                    id=cargo.id,
-                    pickup_location=cargo.pickup_location,
-                    delivery_location=cargo.delivery_location,
-                    nearby_cars_count=await self._count_nearby_cars(cargo, query.distance_min, query.distance_max),
-                ) for cargo in cargos
-            ]
-            await self.cache.set(cache_key, serialized_cargos)
-
-        return serialized_cargos
-
-    async def get_detail(self, cargo_id: int) -> CargoInfoDetail:
-        """Gets info about specific cargo."""
-        cache_key = f'cargo-{cargo_id}'
-        cargo_detail = await self.cache.get(cache_key)
-        if not cargo_detail:
-            try:
-                cargo = await self.cargo_crud.read(cargo_id=cargo_id)
-                cars = await self.car_crud.read_all()
-                cars_info = [
-                    CargoCarsInfo(
-                        number_plate=car.number_plate,
-                        distance_to_cargo=await self._count_distance(car, cargo),
-                    ) for car in cars
-                ]
-                cargo_detail = CargoInfoDetail(
-                    id=cargo.id,
-                    pickup_location=cargo.pickup_location,
-                    delivery_location=cargo.delivery_location,
-                    weight=cargo.weight,
-                    description=cargo.description,
-                    cars_info=cars_info,
-                )
-                await self.cache.set(cache_key, cargo_detail)
-            except NoResultFound:
-                raise HTTPException(
-                    status_code=HTTPStatus.NOT_FOUND,
-                    detail=MSG_CARGO_NOT_FOUND,
-                )
-        return cargo_detail
+        body = await self._get_cached(f'cargo-{query}', lambda service: service._get_list(query))
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+    def stream_list(self, query: QueryParams) -> StreamingResponse:
+        """Streams list of cargos as NDJSON, computing it in batches."""
+        return StreamingResponse(self._iter_list(query), media_type=NDJSON_MEDIA_TYPE)
+
+    async def get_detail(self, cargo_id: int, query: DetailQueryParams) -> Response:
+        """Gets info about specific cargo with its nearest cars."""
+        body = await self._get_cached(
+            f'cargo-{cargo_id}-{query}', lambda service: service._get_detail(cargo_id, query),
+        )
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
 
     async def create(self, data: CargoCreate) -> CargoInfo:
         """Creates new cargo."""
         try:
             cargo = await self.cargo_crud.create(data=data)
-            await self.cache.clear('all')
-            return cargo
         except IntegrityError as e:
             if 'ForeignKeyViolationError' in str(e.orig):
                 raise HTTPException(
@@ -100,12 +129,14 @@ class CargoService:
                 )
             else:
                 raise
+        await self.cache.clear('all')
+        await self._add_pickup_locations([cargo.pickup_location])
+        return cargo
 
     async def update(self, cargo_id: int, data: CargoUpdate) -> CargoInfo:
         """Update specific cargo."""
         try:
             updated_cargo = await self.cargo_crud.update(cargo_id, data)
-            await self.cache.clear(f'cargo-{cargo_id}')
             await self.cache.clear('all')
             return updated_cargo
         except NoResultFound:
@@ -118,7 +149,6 @@ class CargoService:
         """Delete cargo."""
         try:
             await self.cargo_crud.delete(cargo_id)
-            await self.cache.clear(f'cargo-{cargo_id}')
             await self.cache.clear('all')
         except NoResultFound:
             raise HTTPException(
@@ -126,30 +156,337 @@ class CargoService:
                 detail=MSG_CARGO_NOT_FOUND,
             )
 
-    async def _count_nearby_cars(self, cargo: Cargo, distance_min: int, distance_max: int) -> int:
-        """Returns count of cars which are between `distance_min` and `distance_max` from cargo."""
-        cars = await self.car_crud.read_all()
-        nearby_cars = [
-            car for car in cars
-            if await self._count_distance(car, cargo) >= distance_min
-            and await self._count_distance(car, cargo) <= distance_max
+    async def create_list(self, data: list[CargoCreate]) -> list[CargoBatchResult]:
+        """Creates cargos with one commit, cargos with unknown locations are reported per item."""
+        zip_codes = {cargo.pickup_location for cargo in data} | {cargo.delivery_location for cargo in data}
+        existing = await self.location_crud.read_existing(list(zip_codes))
+        valid = [
+            index for index, cargo in enumerate(data)
+            if cargo.pickup_location in existing and cargo.delivery_location in existing
+        ]
+        cargos = []
+        if valid:
+            cargos = await self.cargo_crud.create_list([data[index] for index in valid])
+            await self.cache.clear('all')
+            await self._add_pickup_locations([cargo.pickup_location for cargo in cargos])
+        created = {index: CargoInfo.from_orm(cargo) for index, cargo in zip(valid, cargos)}
+        return [
+            CargoBatchResult(
+                index=index, status_code=HTTPStatus.CREATED, cargo=created[index],
+            ) if index in created else CargoBatchResult(
+                index=index, status_code=HTTPStatus.NOT_FOUND, detail=MSG_LOCATION_NOT_FOUND,
+            ) for index in range(len(data))
+        ]
+
+    async def update_list(self, data: list[CargoUpdateBulk]) -> list[CargoBatchResult]:
+        """Updates cargos with one commit, unknown cargos are reported per item.
+
+        If cargo is repeated in batch, its last item is applied.
+        """
+        last_items = {cargo.id: cargo for cargo in data}
+        updated = {
+            cargo.id: CargoInfo.from_orm(cargo)
+            for cargo in await self.cargo_crud.update_list(list(last_items.values()))
+        }
+        if updated:
+            await self.cache.clear('all')
+        return [
+            CargoBatchResult(
+                index=index, status_code=HTTPStatus.OK, cargo=updated[cargo.id],
+            ) if cargo.id in updated else CargoBatchResult(
+                index=index, status_code=HTTPStatus.NOT_FOUND, detail=MSG_CARGO_NOT_FOUND,
+            ) for index, cargo in enumerate(data)
+        ]
+
+    async def delete_list(self, cargo_ids: list[int]) -> list[CargoBatchResult]:
+        """Deletes cargos with one commit, unknown cargos are reported per item."""
+        deleted = set(await self.cargo_crud.delete_list(list(set(cargo_ids))))
+        if deleted:
+            await self.cache.clear('all')
+        return [
+            CargoBatchResult(
+                index=index, status_code=HTTPStatus.NO_CONTENT,
+            ) if cargo_id in deleted else CargoBatchResult(
+                index=index, status_code=HTTPStatus.NOT_FOUND, detail=MSG_CARGO_NOT_FOUND,
+            ) for index, cargo_id in enumerate(cargo_ids)
         ]
-        return len(nearby_cars)
-
-    async def _count_distance(self, car: Car, cargo: Cargo) -> float:
-        """Count distance in miles between given car and cargo."""
-        car_location = await self._get_location(car.current_location)
-        cargo_location = await self._get_location(cargo.pickup_location)
-        car_coordinates = (car_location.latitude, car_location.longtitude)
-        cargo_coordinates = (cargo_location.latitude, cargo_location.longtitude)
-        return distance(car_coordinates, cargo_coordinates).miles
-
-    async def _get_location(self, location_zip: int) -> Location:
-        """Returns location with given zip_code."""
+
+    async def _add_pickup_locations(self, zip_codes: list[int]) -> None:
+        """Adds nearby cars counts of new pickup locations after cargos were committed.
+
+        Updates and deletes never change pickup locations, so only creates add counts.
+        Failure is not returned to client, lists compute missing counts per request
+        until refresh adds them.
+        """
+        if NEARBY_CARS_BACKEND != NEARBY_CARS_BACKEND_BUCKETS:
+            return
+        try:
+            await self.nearby_cars_buckets.add_locations(zip_codes)
+        except Exception as e:
+            logger.warning(f'Не удалось добавить счетчики машин рядом с грузами: {e}')
+            await self.nearby_cars_buckets.bucket_crud.session.rollback()
+            schedule_refresh(self.cache)
+
+    async def _get_cached(self, cache_key: str, build: Builder) -> bytes:
+        """Returns cached response body, concurrent misses of the same key build it once.
+
+        `build` gets service instance, so the body is built by a service with
+        its own session, which outlives request of any caller.
+        """
+        if STALE_WHILE_REVALIDATE:
+            return await self._get_cached_stale(cache_key, build)
+        body = await self.cache.get_raw(cache_key)
+        if body is None:
+            body = await self.single_flight.do(
+                cache_key,
+                lambda: self._build_shared(lambda service: service._build_cached(cache_key, build)),
+                cached=lambda: self.cache.get_raw(cache_key),
+            )
+        return body
+
+    async def _build_shared(
+        self, build_cached: Callable[['CargoService'], Awaitable[bytes]],
+    ) -> bytes:
+        """Builds body awaited by concurrent callers with a new session.
+
+        Session of the first caller is closed if its request is cancelled,
+        which must not fail the others.
+        """
+        async with self._own_service() as service:
+            return await build_cached(service)
+
+    async def _build_cached(self, cache_key: str, build: Builder) -> bytes:
+        """Builds response body and stores it in cache."""
+        body = self.response_codec.dumps(await build(self))
+        await self.cache.set_raw(cache_key, body)
+        return body
+
+    async def _get_cached_stale(self, cache_key: str, build: Builder) -> bytes:
+        """Returns cached response body, stale one is returned at once and refreshed in background.
+
+        Entry is stale when it is older than `SOFT_EXPIRE_TIME` or fleet moved
+        after it was built. Redis drops it after `HARD_EXPIRE_TIME`.
+        """
+        entry, version = await self.cache.get_versioned_raw(cache_key)
+        if entry is None:
+            entry = await self.single_flight.do(
+                cache_key,
+                lambda: self._build_shared(
+                    lambda service: service._build_cached_stale(cache_key, build, version),
+                ),
+                cached=lambda: self._get_fresh_entry(cache_key),
+            )
+        soft_expires_at, entry_version = STALE_HEADER.unpack_from(entry)
+        if entry_version != version or soft_expires_at <= time.time():
+            self._schedule_refresh(cache_key, build, version)
+        return entry[STALE_HEADER.size:]
+
+    async def _build_cached_stale(self, cache_key: str, build: Builder, version: int) -> bytes:
+        """Builds response body and stores it in cache with soft expiry and version header."""
+        body = self.response_codec.dumps(await build(self))
+        entry = STALE_HEADER.pack(time.time() + SOFT_EXPIRE_TIME, version) + body
+        await self.cache.set_raw(cache_key, entry, HARD_EXPIRE_TIME)
+        return entry
+
+    async def _get_fresh_entry(self, cache_key: str) -> bytes | None:
+        """Returns cached entry if it is not stale."""
+        entry, version = await self.cache.get_versioned_raw(cache_key)
+        if entry is None:
+            return None
+        soft_expires_at, entry_version = STALE_HEADER.unpack_from(entry)
+        return entry if entry_version == version and soft_expires_at > time.time() else None
+
+    def _schedule_refresh(self, cache_key: str, build: Builder, version: int) -> None:
+        """Rebuilds stale entry in background, once per key."""
+        task = asyncio.create_task(self.single_flight.do(
+            f'refresh-{cache_key}',
+            lambda: self._refresh(cache_key, build, version),
+            cached=lambda: self._get_fresh_entry(cache_key),
+        ))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    async def _refresh(self, cache_key: str, build: Builder, version: int) -> bytes | None:
+        """Rebuilds entry with a new session, as request session is closed by then."""
         try:
-            location = await self.location_crud.read(location_zip)
-            return location
+            async with self._own_service() as service:
+                return await service._build_cached_stale(cache_key, build, version)
+        except Exception as e:
+            # Nobody awaits background refresh, stale entry is kept until the next attempt.
+            logger.warning(f'Не удалось обновить кэш {cache_key}: {e}')
+            return None
+
+    @asynccontextmanager
+    async def _own_service(self) -> AsyncIterator['CargoService']:
+        """Yields service sharing caches and indexes of this one, bound to a new session."""
+        async with self.session_factory() as session:
+            # Values built by this session are cached, so they must not miss recent writes.
+            session.info[READS_AFTER_WRITES] = True
+            yield CargoService(
+                CargoCRUD(session),
+                CarCRUD(session),
+                LocationCRUD(session),
+                self.cache,
+                self.coordinate_index,
+                self.fleet_index,
+                self.sorted_distance_cache,
+                self.single_flight,
+                get_nearby_cars_bucket_service(session),
+                self.session_factory,
+            )
+
+    async def _iter_list(self, query: QueryParams) -> AsyncIterator[bytes]:
+        """Yields NDJSON lines of cargos, one batch of `STREAM_BATCH_SIZE` cargos at a time."""
+        cursor, remaining = query.cursor, query.limit
+        while remaining is None or remaining > 0:
+            batch_size = STREAM_BATCH_SIZE if remaining is None else min(STREAM_BATCH_SIZE, remaining)
+            cargos = await self._get_list(query.copy(update={'cursor': cursor, 'limit': batch_size}))
+            if cargos:
+                yield b''.join(self.response_codec.dumps(cargo) + b'\n' for cargo in cargos)
+            if len(cargos) < batch_size:
+                return
+            cursor = cargos[-1].id
+            if remaining is not None:
+                remaining -= len(cargos)
+
+    @traced
+    async def _get_list(self, query: QueryParams) -> list[CargoListElement]:
+        """Builds list of cargos with backend configured by `NEARBY_CARS_BACKEND`."""
+        if NEARBY_CARS_BACKEND == NEARBY_CARS_BACKEND_SQL:
+            return await self._get_list_sql(query)
+        if NEARBY_CARS_BACKEND == NEARBY_CARS_BACKEND_BUCKETS:
+            cargos = await self._get_list_buckets(query)
+            if cargos is not None:
+                return cargos
+        return await self._get_list_python(query)
+
+    @traced
+    async def _get_detail(self, cargo_id: int, query: DetailQueryParams) -> CargoInfoDetail:
+        """Builds info about specific cargo with cars sorted by distance to it."""
+        try:
+            cargo = await self.cargo_crud.read(cargo_id=cargo_id)
         except NoResultFound:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=MSG_CARGO_NOT_FOUND,
+            )
+        fleet = await self._get_fleet()
+        distances = await self._count_distances(cargo.pickup_location, fleet)
+        rows = nearest(distances, query.limit, query.max_distance)
+        cars_info = [
+            CargoCarsInfo(
+                number_plate=fleet.number_plates[row],
+                distance_to_cargo=distance,
+            ) for row, distance in zip(rows.tolist(), distances[rows].tolist())
+        ]
+        return CargoInfoDetail(
+            id=cargo.id,
+            pickup_location=cargo.pickup_location,
+            delivery_location=cargo.delivery_location,
+            weight=cargo.weight,
+            description=cargo.description,
+            cars_info=cars_info,
+        )
+
+    async def _get_list_python(self, query: QueryParams) -> list[CargoListElement]:
+        """Builds list of cargos counting nearby cars with fleet index."""
+        cargos = await self.cargo_crud.read_list(
+            query.weight_min, query.weight_max, query.cursor, query.limit,
+        )
+        fleet = await self._get_fleet()
+        nearby_cars_counts = await self._count_nearby_cars(
+            cargos, fleet, query.distance_min, query.distance_max,
+        )
+        return [
+            CargoListElement(
+                id=cargo.id,
+                pickup_location=cargo.pickup_location,
+                delivery_location=cargo.delivery_location,
+                nearby_cars_count=nearby_cars_count,
+            ) for cargo, nearby_cars_count in zip(cargos, nearby_cars_counts)
+        ]
+
+    async def _get_list_sql(self, query: QueryParams) -> list[CargoListElement]:
+        """Builds list of cargos counting nearby cars in one database query."""
+        cargos = await self.cargo_crud.read_all_with_nearby_cars_count(
+            query.weight_min,
+            query.weight_max,
+            query.distance_min,
+            query.distance_max,
+            query.cursor,
+            query.limit,
+        )
+        return [CargoListElement.from_orm(cargo) for cargo in cargos]
+
+    async def _get_list_buckets(self, query: QueryParams) -> list[CargoListElement] | None:
+        """Builds list of cargos reading nearby cars counts from `nearby_cars_bucket` table.
+
+        Returns `None` if distances are not bucket edges or some pickup location
+        has no counts yet, then counts are computed per request.
+        """
+        edges = self.nearby_cars_buckets.edges
+        if query.distance_min not in edges or query.distance_max not in edges:
+            return None
+        cargos = await self.cargo_crud.read_list_with_bucket_counts(
+            query.weight_min,
+            query.weight_max,
+            query.distance_min,
+            query.distance_max,
+            query.cursor,
+            query.limit,
+        )
+        if any(cargo.nearby_cars_count is None for cargo in cargos):
+            return None
+        return [CargoListElement.from_orm(cargo) for cargo in cargos]
+
+    @traced
+    async def _count_nearby_cars(
+        self,
+        cargos: list[Cargo],
+        fleet: FleetSnapshot,
+        distance_min: int,
+        distance_max: int,
+    ) -> list[int]:
+        """Returns counts of cars which are between `distance_min` and `distance_max` from each cargo."""
+        if not cargos or not len(fleet):
+            return [0] * len(cargos)
+        pickup_zips, cargo_rows = np.unique(
+            [cargo.pickup_location for cargo in cargos], return_inverse=True,
+        )
+        pickup_coordinates = await self._get_coordinates(pickup_zips)
+        if self.sorted_distance_cache.fits(fleet, len(pickup_zips)):
+            with DISTANCE_DURATION.labels('sorted_distance_cache').time():
+                counts = self.sorted_distance_cache.count(
+                    fleet, pickup_zips, pickup_coordinates, distance_min, distance_max,
+                )
+        else:
+            # Sorted arrays for every pickup location do not fit in memory, query fleet index instead.
+            # Fleet index is shared between requests, sync re-buckets only moved cars.
+            with DISTANCE_DURATION.labels('fleet_index').time():
+                self.fleet_index.sync(fleet.car_ids, fleet.coordinates)
+                counts = self.fleet_index.count(pickup_coordinates, distance_min, distance_max)
+        return counts[cargo_rows.reshape(-1)].tolist()
+
+    @traced
+    async def _count_distances(self, pickup_location: int, fleet: FleetSnapshot) -> np.ndarray:
+        """Count distances in miles between given pickup location and each car of the fleet."""
+        if not len(fleet):
+            return np.empty(0)
+        [pickup_coordinates] = await self._get_coordinates([pickup_location])
+        with DISTANCE_DURATION.labels('distances_from').time():
+            return distances_from(pickup_coordinates, fleet.coordinates)
+
+    async def _get_fleet(self) -> FleetSnapshot:
+        """Returns fleet snapshot with coordinates, read once per request."""
+        if self._fleet is None:
+            self._fleet = FleetSnapshot.from_rows(await self.car_crud.read_fleet())
+        return self._fleet
+
+    async def _get_coordinates(self, location_zips: list[int]) -> np.ndarray:
+        """Returns `(latitude, longtitude)` array for given zip codes from coordinate index."""
+        try:
+            return await self.coordinate_index.lookup_loaded(location_zips, self.location_crud)
+        except KeyError:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail=MSG_LOCATION_NOT_FOUND,
@@ -158,10 +495,27 @@ class CargoService:
 
 def get_cargo_service(
         session: AsyncSession = Depends(get_session),
-        cache: AbstractCache = Depends(get_redis_cache),
+        cache: AbstractCache = Depends(get_cache),
+        coordinate_index: CoordinateIndex = Depends(get_coordinate_index),
+        fleet_index: FleetIndex = Depends(get_fleet_index),
+        sorted_distance_cache: SortedDistanceCache = Depends(get_sorted_distance_cache),
+        single_flight: SingleFlight = Depends(get_single_flight),
+        session_factory: SessionFactory = Depends(get_session_factory),
 ):
     """Returns `CargoService` instance."""
+    nearby_cars_buckets = get_nearby_cars_bucket_service(session)
     cargo_crud = CargoCRUD(session)
     car_crud = CarCRUD(session)
     location_crud = LocationCRUD(session)
-    return CargoService(cargo_crud, car_crud, location_crud, cache)
+    return CargoService(
+        cargo_crud,
+        car_crud,
+        location_crud,
+        cache,
+        coordinate_index,
+        fleet_index,
+        sorted_distance_cache,
+        single_flight,
+        nearby_cars_buckets,
+        session_factory,
+    )
@@ -1,18 +1,29 @@
-import csv
+import asyncio
 import random
 import string
+import time
 
-import aiofiles  # type: ignore
-from aiocsv import AsyncDictReader
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cars_app.cache.abstract_cache import AbstractCache
-from cars_app.cache.module import get_redis_cache
+from cars_app.cache.module import clear_after_fleet_move
+from cars_app.cache.tiered import get_cache
 from cars_app.database.crud.car import CarCRUD
 from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.loader import LocationsLoader
 from cars_app.database.models import Car, Location
+from cars_app.geo.index import CoordinateIndex, coordinate_index
+from cars_app.geo.snapshot import get_location_snapshot, is_snapshot_available
 from cars_app.logging.module import logger
-from cars_app.validation.schemas import CarCreate, CarUpdateBulk, LocationCreate
+from cars_app.metrics.module import JOB_DURATION
+from cars_app.services.nearby_cars import (
+    NEARBY_CARS_BACKEND_BUCKETS,
+    NearbyCarsBucketService,
+    get_nearby_cars_bucket_service,
+)
+from cars_app.validation.schemas import CarCreate
+from config import NEARBY_CARS_BACKEND
 
 
 class HelperService:
@@ -20,29 +31,33 @@ class HelperService:
             self,
             location_crud: LocationCRUD,
             car_crud: CarCRUD,
-            cache: AbstractCache
+            cache: AbstractCache,
+            coordinate_index: CoordinateIndex,
+            nearby_cars_buckets: NearbyCarsBucketService,
     ) -> None:
         """Inits `HelperService` instance."""
         self.location_crud = location_crud
         self.car_crud = car_crud
         self.cache = cache
+        self.coordinate_index = coordinate_index
+        self.nearby_cars_buckets = nearby_cars_buckets
+        self.random = np.random.default_rng()
 
     async def populate_locations(self) -> None:
         """Populates database with locations."""
         if not await self._is_populated_with_locations():
-            locations_data = await self._read_locations_from_source()
-            locations_list = [
-                LocationCreate(
-                    city=location['city'],
-                    state=location['state_name'],
-                    zip_code=int(location['zip']),
-                    latitude=float(location['lat']),
-                    longtitude=float(location['lng']),
-                ) for location in locations_data
-            ]
-            await self.location_crud.create_list(locations_list)
+            snapshot = await asyncio.to_thread(get_location_snapshot)
+            await LocationsLoader(self.location_crud).load_snapshot(snapshot)
+            self.coordinate_index.invalidate()
         logger.info('Локации загружены в БД.')
 
+    async def load_coordinate_index(self) -> None:
+        """Loads in-memory coordinate index from locations snapshot, or from database without it."""
+        if is_snapshot_available():
+            self.coordinate_index.load_snapshot(await asyncio.to_thread(get_location_snapshot))
+        else:
+            await self.coordinate_index.load(self.location_crud)
+
     async def populate_cars(self) -> None:
         """Populates database with cars."""
         if not await self._is_populated_with_cars():
@@ -52,28 +67,31 @@ class HelperService:
 
     async def update_locations_random(self) -> None:
         """Update current locations of all cars randomly."""
-        cars_update_list = []
-        cars = await self.car_crud.read_all()
-        locations = await self.location_crud.read_all()
-        locations_zips = [location.zip_code for location in locations]
-        for car in cars:
-            avaliable_zips = [
-                zip_code for zip_code in locations_zips if zip_code != car.current_location
-            ]
-            cars_update_list.append(CarUpdateBulk(
-                id=car.id, current_location=random.choice(avaliable_zips))
-            )
-        await self.car_crud.update_list(cars_update_list)
-        await self.cache.clear('all')
-        logger.info('Локации машин обновлены.')
-
-    async def _read_locations_from_source(self) -> list:
-        """Read locations data from 'uszips.csv' file."""
-        locations_data = []
-        async with aiofiles.open('uszips.csv', mode='r', encoding='utf-8', newline='') as file:
-            async for row in AsyncDictReader(file, quoting=csv.QUOTE_ALL):
-                locations_data.append(row)
-        return locations_data
+        started = time.perf_counter()
+        cars = await self.car_crud.read_locations()
+        # Zip codes are read from table rather than coordinate index, which may be loaded
+        # from snapshot, so every drawn location satisfies foreign key of cars. Current
+        # locations of cars are referenced by them, so they are all among zip codes.
+        zip_codes = np.array(await self.location_crud.read_zip_codes(), dtype=np.int64)
+        if not cars or len(zip_codes) < 2:
+            return
+        car_ids, current_zips = np.array(cars, dtype=np.int64).T
+        # Draw from all locations but one and shift draws at or past current location,
+        # so new location is uniform among the others and never equals the current one.
+        current_rows = np.searchsorted(zip_codes, current_zips)
+        new_rows = self.random.integers(0, len(zip_codes) - 1, size=len(car_ids))
+        new_rows += new_rows >= current_rows
+        await self.car_crud.update_locations(car_ids.tolist(), zip_codes[new_rows].tolist())
+        await self.refresh_nearby_cars_buckets()
+        await clear_after_fleet_move(self.cache)
+        elapsed = time.perf_counter() - started
+        JOB_DURATION.labels('update_locations_random').observe(elapsed)
+        logger.info(f'Локации машин обновлены: {len(car_ids)} машин за {elapsed:.3f} с.')
+
+    async def refresh_nearby_cars_buckets(self) -> None:
+        """Recomputes nearby cars counts of pickup locations if cargo list reads them."""
+        if NEARBY_CARS_BACKEND == NEARBY_CARS_BACKEND_BUCKETS:
+            await self.nearby_cars_buckets.refresh()
 
     async def _generate_cars(self) -> list[CarCreate]:
         """Generate cars data."""
@@ -100,12 +118,8 @@ class HelperService:
 
     async def _get_location_zips(self) -> list:
         """Get list of locations zip codes."""
-        zips: list[int] = []
-        locations_list = await self._read_locations_from_source()
-        while len(zips) < 20:
-            random_location = random.choice(locations_list)
-            zips.append(random_location['zip'])
-        return zips
+        snapshot = await asyncio.to_thread(get_location_snapshot)
+        return [int(snapshot.zip_codes[random.randrange(len(snapshot))]) for _ in range(20)]
 
     async def _is_populated_with_locations(self) -> Location | None:
         """Checks if database is populated with locations."""
@@ -120,5 +134,6 @@ def get_helper_service(session: AsyncSession):
     """Returns `HelperService` instance."""
     location_crud = LocationCRUD(session)
     car_crud = CarCRUD(session)
-    cache = get_redis_cache()
-    return HelperService(location_crud, car_crud, cache)
+    cache = get_cache()
+    nearby_cars_buckets = get_nearby_cars_bucket_service(session)
+    return HelperService(location_crud, car_crud, cache, coordinate_index, nearby_cars_buckets)
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cars_app.cache.abstract_cache import AbstractCache
+from cars_app.cache.module import clear_after_fleet_move
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.cargo import CargoCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.crud.nearby_cars_bucket import NearbyCarsBucketCRUD
+from cars_app.database.settings import async_session
+from cars_app.exceptions.constants import MSG_LOCATION_NOT_FOUND
+from cars_app.geo.buckets import count_at_edges
+from cars_app.geo.fleet import FleetSnapshot
+from cars_app.geo.index import CoordinateIndex, coordinate_index
+from cars_app.logging.module import logger
+from cars_app.metrics.module import JOB_DURATION
+from cars_app.tracing.module import traced_methods
+from config import NEARBY_CARS_BUCKET_EDGES
+
+NEARBY_CARS_BACKEND_BUCKETS = 'buckets'
+# Refreshes of a process run one at a time, so counts of an older fleet never overwrite newer ones.
+refresh_lock = asyncio.Lock()
+refresh_task: asyncio.Task | None = None
+refresh_requested = False
+
+
+@traced_methods
+class NearbyCarsBucketService:
+    """Maintains `nearby_cars_bucket` table with counts of cars around pickup locations.
+
+    Counts depend on pickup location only, so they are kept per location rather
+    than per cargo: cargo writes add counts of new pickup locations and fleet
+    moves recompute all of them.
+    """
+
+    def __init__(
+            self,
+            bucket_crud: NearbyCarsBucketCRUD,
+            cargo_crud: CargoCRUD,
+            car_crud: CarCRUD,
+            location_crud: LocationCRUD,
+            coordinate_index: CoordinateIndex,
+            edges: list[int] = NEARBY_CARS_BUCKET_EDGES,
+    ) -> None:
+        """Inits `NearbyCarsBucketService` instance."""
+        self.bucket_crud = bucket_crud
+        self.cargo_crud = cargo_crud
+        self.car_crud = car_crud
+        self.location_crud = location_crud
+        self.coordinate_index = coordinate_index
+        self.edges = sorted(edges)
+
+    async def refresh(self) -> None:
+        """Recomputes counts of every pickup location for current fleet."""
+        async with refresh_lock:
+            started = time.perf_counter()
+            zip_codes = await self.cargo_crud.read_pickup_locations()
+            within, closer = await self._count(zip_codes)
+            await self.bucket_crud.replace(*self._columns(zip_codes, within, closer))
+            elapsed = time.perf_counter() - started
+            JOB_DURATION.labels('refresh_nearby_cars_buckets').observe(elapsed)
+            logger.info(
+                f'Счетчики машин рядом с грузами обновлены: {len(zip_codes)} локаций '
+                f'за {elapsed:.3f} с.',
+            )
+
+    async def add_locations(self, zip_codes: list[int]) -> None:
+        """Computes counts of given pickup locations which have none yet."""
+        missing = sorted(set(zip_codes) - await self.bucket_crud.read_zip_codes(zip_codes))
+        if not missing:
+            return
+        within, closer = await self._count(missing)
+        await self.bucket_crud.create_missing(*self._columns(missing, within, closer))
+
+    async def _count(self, zip_codes: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """Returns counts of cars within and closer than each edge from given locations."""
+        fleet = FleetSnapshot.from_rows(await self.car_crud.read_fleet())
+        try:
+            coordinates = await self.coordinate_index.lookup_loaded(zip_codes, self.location_crud)
+        except KeyError:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=MSG_LOCATION_NOT_FOUND,
+            )
+        # Distances are computed in a thread, so requests are served while counts are refreshed.
+        return await asyncio.to_thread(count_at_edges, coordinates, fleet.coordinates, self.edges)
+
+    def _columns(self, zip_codes: list[int], within: np.ndarray, closer: np.ndarray) -> tuple:
+        """Returns columns of `(zip_code, edge)` rows from per location count arrays."""
+        return (
+            np.repeat(np.asarray(zip_codes, dtype=np.int64), len(self.edges)).tolist(),
+            np.tile(self.edges, len(zip_codes)).tolist(),
+            within.ravel().tolist(),
+            closer.ravel().tolist(),
+        )
+
+
+def schedule_refresh(cache: AbstractCache) -> None:
+    """Refreshes counts in background, fleet moves during refresh cause one more refresh."""
+    global refresh_task, refresh_requested
+    refresh_requested = True
+    if refresh_task is None or refresh_task.done():
+        refresh_task = asyncio.create_task(_refresh_while_requested(cache))
+
+
+async def _refresh_while_requested(cache: AbstractCache) -> None:
+    """Refreshes counts with its own session until no more refreshes are requested."""
+    global refresh_requested
+    while refresh_requested:
+        refresh_requested = False
+        try:
+            async with async_session() as session:
+                await get_nearby_cars_bucket_service(session).refresh()
+            # Lists built from previous counts after the move are dropped as well.
+            await clear_after_fleet_move(cache)
+        except Exception as e:
+            logger.warning(f'Не удалось обновить счетчики машин рядом с грузами: {e}')
+
+
+def get_nearby_cars_bucket_service(session: AsyncSession):
+    """Returns `NearbyCarsBucketService` instance."""
+    return NearbyCarsBucketService(
+        NearbyCarsBucketCRUD(session),
+        CargoCRUD(session),
+        CarCRUD(session),
+        LocationCRUD(session),
+        coordinate_index,
+    )
@@ -0,0 +1,134 @@
+import math
+import time
+from http import HTTPStatus
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cars_app.cache.abstract_cache import AbstractCache
+from cars_app.cache.module import clear_after_fleet_move
+from cars_app.cache.tiered import get_cache
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.settings import get_session
+from cars_app.exceptions.constants import (
+    MSG_LOCATION_NOT_FOUND,
+    MSG_TELEMETRY_BUFFER_FULL,
+)
+from cars_app.logging.module import logger
+from cars_app.metrics.module import JOB_DURATION, TELEMETRY_UPDATES
+from cars_app.services.nearby_cars import NEARBY_CARS_BACKEND_BUCKETS, schedule_refresh
+from cars_app.tracing.module import traced_methods
+from cars_app.validation.schemas import CarUpdateBulk, TelemetryAccepted
+from config import NEARBY_CARS_BACKEND, TELEMETRY_BUFFER_SIZE, TELEMETRY_FLUSH_INTERVAL
+
+
+class TelemetryBuffer:
+    """Latest reported location of each car, waiting to be written to database.
+
+    Updates of a car coalesce, so buffer size is bounded by count of distinct
+    cars and a flush writes each car once however often it reported.
+    """
+
+    def __init__(self, max_size: int = TELEMETRY_BUFFER_SIZE) -> None:
+        """Init empty `TelemetryBuffer` instance."""
+        self.max_size = max_size
+        self._locations: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def add(self, updates: list[CarUpdateBulk]) -> int | None:
+        """Adds updates, returns count of replaced pending ones or `None` if buffer is full."""
+        new_cars = {update.id for update in updates} - self._locations.keys()
+        if len(self._locations) + len(new_cars) > self.max_size:
+            return None
+        for update in updates:
+            self._locations[update.id] = update.current_location
+        return len(updates) - len(new_cars)
+
+    def drain(self) -> dict[int, int]:
+        """Returns buffered locations by car id and empties buffer."""
+        locations, self._locations = self._locations, {}
+        return locations
+
+    def restore(self, locations: dict[int, int]) -> None:
+        """Puts back drained locations which were not written, newer updates take precedence."""
+        for car_id, zip_code in locations.items():
+            self._locations.setdefault(car_id, zip_code)
+
+
+@traced_methods
+class TelemetryService:
+    def __init__(
+        self,
+        car_crud: CarCRUD,
+        location_crud: LocationCRUD,
+        cache: AbstractCache,
+        buffer: TelemetryBuffer,
+    ) -> None:
+        """Init `TelemetryService` instance."""
+        self.car_crud = car_crud
+        self.location_crud = location_crud
+        self.cache = cache
+        self.buffer = buffer
+
+    async def ingest(self, data: list[CarUpdateBulk]) -> TelemetryAccepted:
+        """Buffers car positions until next flush, rejects them while buffer is full."""
+        zip_codes = {update.current_location for update in data}
+        # Unknown locations are rejected here, as one of them would fail the whole flush.
+        if await self.location_crud.read_existing(list(zip_codes)) != zip_codes:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=MSG_LOCATION_NOT_FOUND,
+            )
+        coalesced = self.buffer.add(data)
+        if coalesced is None:
+            TELEMETRY_UPDATES.labels('rejected').inc(len(data))
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail=MSG_TELEMETRY_BUFFER_FULL,
+                headers={'Retry-After': str(math.ceil(TELEMETRY_FLUSH_INTERVAL))},
+            )
+        TELEMETRY_UPDATES.labels('accepted').inc(len(data) - coalesced)
+        TELEMETRY_UPDATES.labels('coalesced').inc(coalesced)
+        return TelemetryAccepted(accepted=len(data), buffered=len(self.buffer))
+
+    async def flush(self) -> int:
+        """Writes buffered locations with one `UPDATE`, clears cargo cache once, returns cars count.
+
+        Locations of unknown cars are skipped. If write fails, locations are kept
+        for the next flush.
+        """
+        locations = self.buffer.drain()
+        if not locations:
+            return 0
+        started = time.perf_counter()
+        try:
+            await self.car_crud.update_locations(list(locations.keys()), list(locations.values()))
+        except Exception as e:
+            self.buffer.restore(locations)
+            logger.warning(f'Не удалось записать телеметрию машин: {e}')
+            return 0
+        await clear_after_fleet_move(self.cache)
+        if NEARBY_CARS_BACKEND == NEARBY_CARS_BACKEND_BUCKETS:
+            schedule_refresh(self.cache)
+        JOB_DURATION.labels('flush_telemetry').observe(time.perf_counter() - started)
+        return len(locations)
+
+
+telemetry_buffer = TelemetryBuffer()
+
+
+def get_telemetry_buffer():
+    """Returns `TelemetryBuffer` instance for dependency injection."""
+    return telemetry_buffer
+
+
+def get_telemetry_service(
+        session: AsyncSession = Depends(get_session),
+        cache: AbstractCache = Depends(get_cache),
+        buffer: TelemetryBuffer = Depends(get_telemetry_buffer),
+):
+    """Returns `TelemetryService` instance."""
+    return TelemetryService(CarCRUD(session), LocationCRUD(session), cache, buffer)
@@ -0,0 +1,80 @@
+import functools
+import inspect
+
+from fastapi import Request, Response
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from config import TRACING_EXPORTER, TRACING_FILE
+
+TRACING_EXPORTER_CONSOLE = 'console'
+TRACING_EXPORTER_FILE = 'file'
+TRACING_EXPORTER_MEMORY = 'memory'
+
+tracer = trace.get_tracer('cars_app')
+span_exporter: SpanExporter | None = None
+
+
+def configure_tracing(exporter: str = TRACING_EXPORTER) -> SpanExporter | None:
+    """Sets up tracer provider with given exporter once, without exporter spans are not recorded."""
+    global span_exporter
+    if span_exporter is not None or not exporter:
+        return span_exporter
+    if exporter == TRACING_EXPORTER_CONSOLE:
+        span_exporter, processor_class = ConsoleSpanExporter(), BatchSpanProcessor
+    elif exporter == TRACING_EXPORTER_FILE:
+        span_exporter = ConsoleSpanExporter(
+            out=open(TRACING_FILE, 'a', encoding='utf-8'),
+            formatter=lambda span: span.to_json(indent=None) + '\n',
+        )
+        processor_class = BatchSpanProcessor
+    elif exporter == TRACING_EXPORTER_MEMORY:
+        span_exporter, processor_class = InMemorySpanExporter(), SimpleSpanProcessor
+    else:
+        raise ValueError(f'Unknown tracing exporter: {exporter!r}')
+    provider = TracerProvider(resource=Resource.create({'service.name': 'cars_app'}))
+    provider.add_span_processor(processor_class(span_exporter))
+    trace.set_tracer_provider(provider)
+    return span_exporter
+
+
+def traced(func):
+    """Wraps coroutine function into span named after it, recording count of returned rows."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(func.__qualname__) as span:
+            result = await func(*args, **kwargs)
+            if isinstance(result, list):
+                span.set_attribute('rows', len(result))
+            return result
+
+    return wrapper
+
+
+def traced_methods(cls):
+    """Class decorator tracing every public coroutine method of class."""
+    for name, method in vars(cls).items():
+        if not name.startswith('_') and inspect.iscoroutinefunction(method):
+            setattr(cls, name, traced(method))
+    return cls
+
+
+async def trace_request(request: Request, call_next) -> Response:
+    """Middleware opening root span of request, named after its route template."""
+    with tracer.start_as_current_span(f'{request.method} {request.url.path}') as span:
+        response = await call_next(request)
+        route = request.scope.get('route')
+        if route:
+            span.update_name(f'{request.method} {route.path}')
+        span.set_attribute('http.method', request.method)
+        span.set_attribute('http.status_code', response.status_code)
+        return response
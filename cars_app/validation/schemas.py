@@ -1,7 +1,7 @@
 import re
 
 from fastapi import HTTPException, Query
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, conlist, validator
 
 
 # Location
@@ -37,6 +37,11 @@ class CarUpdateBulk(BaseModel):
     current_location: int
 
 
+class TelemetryAccepted(BaseModel):
+    accepted: int
+    buffered: int
+
+
 class CarCreate(CarPlate):
     current_location: int
     capacity: int = Field(ge=1, le=1000)
@@ -88,6 +93,10 @@ class CargoUpdate(BaseModel):
     description: str
 
 
+class CargoUpdateBulk(CargoUpdate):
+    id: int
+
+
 class CargoListElement(BaseModel):
     id: int
     pickup_location: int
@@ -110,12 +119,32 @@ class CargoInfoDetail(CargoInfo):
     cars_info: list[CargoCarsInfo]
 
 
+class CargoBatchResult(BaseModel):
+    index: int
+    status_code: int
+    cargo: CargoInfo | None = None
+    detail: str | None = None
+
+
+# Batch
+MAX_BATCH_SIZE = 10000
+CargoCreateBatch = conlist(CargoCreate, min_items=1, max_items=MAX_BATCH_SIZE)
+CargoUpdateBatch = conlist(CargoUpdateBulk, min_items=1, max_items=MAX_BATCH_SIZE)
+CargoDeleteBatch = conlist(int, min_items=1, max_items=MAX_BATCH_SIZE)
+CarTelemetryBatch = conlist(CarUpdateBulk, min_items=1, max_items=MAX_BATCH_SIZE)
+
+
 # Query
+MAX_PAGE_SIZE = 10000
+
+
 class QueryParams(BaseModel):
     weight_min: int = Query(default=1, ge=1, le=1000)
     weight_max: int = Query(default=1000, ge=1, le=1000)
     distance_min: int = Query(default=0, ge=0)
     distance_max: int = Query(default=450, ge=0)
+    cursor: int | None = Query(default=None, description='Last cargo id of previous page')
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE)
 
     @validator('weight_max')
     def validate_weight_max(cls, v, values):
@@ -134,3 +163,8 @@ class QueryParams(BaseModel):
                 detail='distance_max должен быть больше или равен distance_min',
             )
         return v
+
+
+class DetailQueryParams(BaseModel):
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE)
+    max_distance: float | None = Query(default=None, ge=0)
@@ -14,6 +14,14 @@ DB_PORT = os.environ.get('DB_PORT', 5432)
 DB_NAME = os.environ.get('DB_NAME')
 DB_USER = os.environ.get('DB_USER')
 DB_PASS = os.environ.get('DB_PASS')
+DB_REPLICA_HOST = os.environ.get('DB_REPLICA_HOST')
+DB_REPLICA_PORT = os.environ.get('DB_REPLICA_PORT', 5432)
+DB_REPLICA_LAG = float(os.environ.get('DB_REPLICA_LAG', 5.0))
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', -1))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 100))
 SQLALCHEMY_ECHO = bool(os.environ.get('SQLALCHEMY_ECHO'))
 TEST_DB_NAME = os.environ.get('TEST_DB_NAME')
 
@@ -22,3 +30,34 @@ REDIS_HOST = os.environ.get('REDIS_HOST')
 REDIS_PORT = os.environ.get('REDIS_PORT')
 REDIS_DB = os.environ.get('REDIS_DB')
 REDIS_EXP = os.environ.get('REDIS_EXP')
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'redis')
+CACHE_CODEC = os.environ.get('CACHE_CODEC', 'json')
+CACHE_LOCK = bool(os.environ.get('CACHE_LOCK'))
+CACHE_LOCK_TIMEOUT = int(os.environ.get('CACHE_LOCK_TIMEOUT', 30))
+CACHE_STALE_WHILE_REVALIDATE = bool(os.environ.get('CACHE_STALE_WHILE_REVALIDATE'))
+LOCAL_CACHE_MAX_BYTES = int(os.environ.get('LOCAL_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+LOCAL_CACHE_TTL = int(os.environ.get('LOCAL_CACHE_TTL', 30))
+
+# Tracing
+TRACING_EXPORTER = os.environ.get('TRACING_EXPORTER', '')
+TRACING_FILE = os.environ.get('TRACING_FILE', 'traces.jsonl')
+
+# Distance
+DISTANCE_MODE = os.environ.get('DISTANCE_MODE', 'ellipsoidal')
+NEARBY_CARS_BACKEND = os.environ.get('NEARBY_CARS_BACKEND', 'python')
+DISTANCE_CACHE_MAX_BYTES = int(os.environ.get('DISTANCE_CACHE_MAX_BYTES', 128 * 1024 * 1024))
+NEARBY_CARS_BUCKET_EDGES = [
+    int(edge) for edge in os.environ.get(
+        'NEARBY_CARS_BUCKET_EDGES', '0,50,100,150,200,250,300,350,400,450,500,600,700,800,900,1000',
+    ).split(',')
+]
+
+# Telemetry
+TELEMETRY_FLUSH_INTERVAL = float(os.environ.get('TELEMETRY_FLUSH_INTERVAL', 1.0))
+TELEMETRY_BUFFER_SIZE = int(os.environ.get('TELEMETRY_BUFFER_SIZE', 100000))
+
+# Locations
+LOCATIONS_SOURCE = os.environ.get('LOCATIONS_SOURCE', 'uszips.csv')
+LOCATIONS_SNAPSHOT = os.environ.get('LOCATIONS_SNAPSHOT', 'uszips.snapshot')
+LOCATIONS_CHUNK_SIZE = int(os.environ.get('LOCATIONS_CHUNK_SIZE', 5000))
+LOCATIONS_RELOAD_INTERVAL = float(os.environ.get('LOCATIONS_RELOAD_INTERVAL', 5.0))
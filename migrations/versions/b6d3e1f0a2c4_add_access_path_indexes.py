@@ -0,0 +1,58 @@
+"""Add access path indexes
+
+Revision ID: b6d3e1f0a2c4
+Revises: 7564a17fd996
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d3e1f0a2c4'
+down_revision = '7564a17fd996'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Weight range scans of cargo list, covering its projection.
+    op.create_index(
+        'ix_cargo_weight_id', 'cargo', ['weight', 'id'],
+        postgresql_include=['pickup_location', 'delivery_location'],
+    )
+    # Keyset pagination by id with weight filter, covering cargo list projection.
+    op.create_index(
+        'ix_cargo_id_list', 'cargo', ['id'],
+        postgresql_include=['weight', 'pickup_location', 'delivery_location'],
+    )
+    op.create_index('ix_cargo_pickup_location', 'cargo', ['pickup_location'])
+    op.create_index('ix_cargo_delivery_location', 'cargo', ['delivery_location'])
+    op.create_index(
+        'ix_car_current_location', 'car', ['current_location'], postgresql_include=['id'],
+    )
+    # Location joins read coordinates from index only.
+    op.create_index(
+        'ix_location_zip_code_coordinates', 'location', ['zip_code'],
+        postgresql_include=['latitude', 'longtitude'],
+    )
+    # Radius search of SQL nearby cars backend, only where `earthdistance` is installed,
+    # so the index is not declared in models.
+    has_earthdistance = op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'earthdistance')"
+    )).scalar()
+    if has_earthdistance:
+        op.execute(
+            'CREATE INDEX ix_location_earth ON location USING gist (ll_to_earth(latitude, longtitude))'
+        )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_location_earth')
+    op.drop_index('ix_location_zip_code_coordinates', table_name='location')
+    op.drop_index('ix_car_current_location', table_name='car')
+    op.drop_index('ix_cargo_delivery_location', table_name='cargo')
+    op.drop_index('ix_cargo_pickup_location', table_name='cargo')
+    op.drop_index('ix_cargo_id_list', table_name='cargo')
+    op.drop_index('ix_cargo_weight_id', table_name='cargo')
@@ -0,0 +1,32 @@
+"""Add nearby cars bucket
+
+Revision ID: d41c7a9e8f53
+Revises: b6d3e1f0a2c4
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41c7a9e8f53'
+down_revision = 'b6d3e1f0a2c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'nearby_cars_bucket',
+        sa.Column('zip_code', sa.Integer(), nullable=False),
+        sa.Column('edge', sa.Integer(), nullable=False),
+        sa.Column('within_count', sa.Integer(), nullable=False),
+        sa.Column('closer_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['zip_code'], ['location.zip_code'], ),
+        sa.PrimaryKeyConstraint('zip_code', 'edge')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('nearby_cars_bucket')
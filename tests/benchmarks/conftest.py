@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+
+from cars_app.cache.module import get_redis_cache
+from cars_app.cache.singleflight import get_single_flight
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.cargo import CargoCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.generator import DataGenerator
+from cars_app.database.models import Car, Cargo
+from cars_app.geo.index import get_coordinate_index
+from cars_app.geo.sorted_distances import get_sorted_distance_cache
+from cars_app.geo.spatial import get_fleet_index
+from cars_app.metrics.module import CACHE_REQUESTS
+from cars_app.services.cargo import CargoService
+from cars_app.services.nearby_cars import get_nearby_cars_bucket_service
+
+BENCHMARK_LOCATIONS = int(os.environ.get('BENCHMARK_LOCATIONS', 5000))
+BENCHMARK_CARS = int(os.environ.get('BENCHMARK_CARS', 1000))
+BENCHMARK_CARGOS = int(os.environ.get('BENCHMARK_CARGOS', 1000))
+BENCHMARK_SEED = int(os.environ.get('BENCHMARK_SEED', 42))
+# Data sizes of endpoint benchmarks as comma separated `cars:cargos` pairs.
+BENCHMARK_SIZES = [
+    tuple(int(count) for count in size.split(':'))
+    for size in os.environ.get('BENCHMARK_SIZES', '100:1000,1000:10000').split(',')
+]
+BENCHMARK_REQUESTS = int(os.environ.get('BENCHMARK_REQUESTS', 100))
+BENCHMARK_OUTPUT = os.environ.get('BENCHMARK_OUTPUT', 'benchmark-results.json')
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skips benchmarks unless `BENCHMARK` environment variable is set."""
+    if os.environ.get('BENCHMARK'):
+        return
+    skip = pytest.mark.skip(reason='set BENCHMARK=1 to run benchmarks')
+    for item in items:
+        if 'benchmarks' in item.nodeid:
+            item.add_marker(skip)
+
+
+@contextmanager
+def timer():
+    """Yields dict which gets `seconds` key with elapsed time on exit."""
+    elapsed = {}
+    start = time.perf_counter()
+    yield elapsed
+    elapsed['seconds'] = time.perf_counter() - start
+
+
+@contextmanager
+def count_queries(engine):
+    """Yields dict which gets `count` key with number of executed SQL statements."""
+    queries = {'count': 0}
+
+    def before_cursor_execute(*args, **kwargs):
+        queries['count'] += 1
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def cache_requests() -> dict[str, float]:
+    """Returns cache reads counted by `CACHE_REQUESTS` so far by result."""
+    totals = {'hit': 0.0, 'miss': 0.0}
+    for metric in CACHE_REQUESTS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith('_total'):
+                totals[sample.labels['result']] += sample.value
+    return totals
+
+
+async def measure(engine, send, requests: int = BENCHMARK_REQUESTS) -> dict:
+    """Sends `requests` requests with `send(i)` one by one and returns their statistics."""
+    latencies = []
+    # Reads of application cache only, Redis keyspace stats would also count internal lookups.
+    requests_before = cache_requests()
+    with count_queries(engine) as queries, timer() as total:
+        for i in range(requests):
+            start = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - start)
+            assert response.is_success, response.text
+    requests_after = cache_requests()
+    hits = requests_after['hit'] - requests_before['hit']
+    misses = requests_after['miss'] - requests_before['miss']
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        'requests': requests,
+        'p50_ms': round(p50, 3),
+        'p95_ms': round(p95, 3),
+        'p99_ms': round(p99, 3),
+        'throughput_rps': round(requests / total['seconds'], 1),
+        'queries_per_request': queries['count'] / requests,
+        'cache_hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+    }
+
+
+@pytest.fixture(scope='session')
+def benchmark_results():
+    """Collects endpoint benchmark results and writes them as JSON at the end of session."""
+    results: list[dict] = []
+    yield results
+    if results:
+        with open(BENCHMARK_OUTPUT, 'w', encoding='utf-8') as file:
+            json.dump({
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'seed': BENCHMARK_SEED,
+                'results': results,
+            }, file, indent=2)
+
+
+@pytest.fixture
+def cargo_service(session):
+    """Returns `CargoService` instance bound to test session."""
+    return CargoService(
+        CargoCRUD(session),
+        CarCRUD(session),
+        LocationCRUD(session),
+        get_redis_cache(),
+        get_coordinate_index(),
+        get_fleet_index(),
+        get_sorted_distance_cache(),
+        get_single_flight(),
+        get_nearby_cars_bucket_service(session),
+    )
+
+
+@pytest_asyncio.fixture
+async def benchmark_data(session):
+    """Populates database with seeded synthetic locations, cars and cargos."""
+    generator = DataGenerator(
+        LocationCRUD(session), CarCRUD(session), CargoCRUD(session), seed=BENCHMARK_SEED,
+    )
+    zip_codes = await generator.generate_locations(BENCHMARK_LOCATIONS)
+    await generator.generate_cars(BENCHMARK_CARS, zip_codes)
+    await generator.generate_cargos(BENCHMARK_CARGOS, zip_codes)
+    return zip_codes
+
+
+@pytest_asyncio.fixture(params=BENCHMARK_SIZES, ids=lambda size: f'{size[0]}cars-{size[1]}cargos')
+async def sized_data(request, session):
+    """Populates database with seeded synthetic data of every size from `BENCHMARK_SIZES`."""
+    cars, cargos = request.param
+    generator = DataGenerator(
+        LocationCRUD(session), CarCRUD(session), CargoCRUD(session), seed=BENCHMARK_SEED,
+    )
+    zip_codes = await generator.generate_locations(BENCHMARK_LOCATIONS)
+    await generator.generate_cars(cars, zip_codes)
+    await generator.generate_cargos(cargos, zip_codes)
+    return {
+        'cars': cars,
+        'cargos': cargos,
+        'zip_codes': zip_codes.tolist(),
+        'car_ids': (await session.execute(select(Car.id))).scalars().all(),
+        'cargo_ids': (await session.execute(select(Cargo.id))).scalars().all(),
+    }
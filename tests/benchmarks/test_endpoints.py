@@ -0,0 +1,87 @@
+import pytest
+
+from cars_app.api.v1.routers.constants import (
+    CAR_UPDATE_FULL,
+    CARGO_CREATE_FULL,
+    CARGO_DELETE_FULL,
+    CARGO_DETAIL_FULL,
+    CARGO_LIST_FULL,
+    CARGO_UPDATE_FULL,
+)
+from tests.benchmarks.conftest import BENCHMARK_REQUESTS, measure
+
+
+async def run(
+    endpoint, db_engine, sized_data, benchmark_results, send, requests: int = BENCHMARK_REQUESTS,
+) -> None:
+    """Measures `send` requests and records result with data size."""
+    result = await measure(db_engine, send, requests)
+    benchmark_results.append({
+        'endpoint': endpoint,
+        'cars': sized_data['cars'],
+        'cargos': sized_data['cargos'],
+        **result,
+    })
+    print(f'\n{endpoint}, {sized_data["cars"]} cars, {sized_data["cargos"]} cargos: {result}')
+
+
+@pytest.mark.asyncio
+async def test_cargo_list(client, db_engine, sized_data, benchmark_results):
+    """Benchmarks `cargo_list` endpoint."""
+    await run('GET /cargos', db_engine, sized_data, benchmark_results, lambda i: client.get(
+        CARGO_LIST_FULL, params={'limit': 100},
+    ))
+
+
+@pytest.mark.asyncio
+async def test_cargo_detail(client, db_engine, sized_data, benchmark_results):
+    """Benchmarks `cargo_detail` endpoint over a rotating set of cargos."""
+    cargo_ids = sized_data['cargo_ids']
+    await run('GET /cargos/{id}', db_engine, sized_data, benchmark_results, lambda i: client.get(
+        CARGO_DETAIL_FULL.format(cargo_id=cargo_ids[i % 10]), params={'limit': 10},
+    ))
+
+
+@pytest.mark.asyncio
+async def test_cargo_create(client, db_engine, sized_data, benchmark_results):
+    """Benchmarks `cargo_create` endpoint."""
+    zip_codes = sized_data['zip_codes']
+    await run('POST /cargos', db_engine, sized_data, benchmark_results, lambda i: client.post(
+        CARGO_CREATE_FULL,
+        json={
+            'pickup_location': zip_codes[i % len(zip_codes)],
+            'delivery_location': zip_codes[-1 - i % len(zip_codes)],
+            'weight': i % 1000 + 1,
+            'description': 'Benchmark cargo',
+        },
+    ))
+
+
+@pytest.mark.asyncio
+async def test_cargo_update(client, db_engine, sized_data, benchmark_results):
+    """Benchmarks `cargo_update` endpoint."""
+    cargo_ids = sized_data['cargo_ids']
+    await run('PATCH /cargos/{id}', db_engine, sized_data, benchmark_results, lambda i: client.patch(
+        CARGO_UPDATE_FULL.format(cargo_id=cargo_ids[i % len(cargo_ids)]),
+        json={'weight': i % 1000 + 1, 'description': 'Updated benchmark cargo'},
+    ))
+
+
+@pytest.mark.asyncio
+async def test_cargo_delete(client, db_engine, sized_data, benchmark_results):
+    """Benchmarks `cargo_delete` endpoint, deleting a different cargo with each request."""
+    # Every cargo can be deleted once, so there are no more requests than seeded cargos.
+    cargo_ids = sized_data['cargo_ids'][:BENCHMARK_REQUESTS]
+    await run('DELETE /cargos/{id}', db_engine, sized_data, benchmark_results, lambda i: client.delete(
+        CARGO_DELETE_FULL.format(cargo_id=cargo_ids[i]),
+    ), requests=len(cargo_ids))
+
+
+@pytest.mark.asyncio
+async def test_car_update(client, db_engine, sized_data, benchmark_results):
+    """Benchmarks `car_update` endpoint."""
+    car_ids, zip_codes = sized_data['car_ids'], sized_data['zip_codes']
+    await run('PATCH /cars/{id}', db_engine, sized_data, benchmark_results, lambda i: client.patch(
+        CAR_UPDATE_FULL.format(car_id=car_ids[i % len(car_ids)]),
+        json={'current_location': zip_codes[i % len(zip_codes)]},
+    ))
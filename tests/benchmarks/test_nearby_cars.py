@@ -0,0 +1,52 @@
+import pytest
+
+from cars_app.validation.schemas import QueryParams
+from tests.benchmarks.conftest import (
+    BENCHMARK_CARGOS,
+    BENCHMARK_CARS,
+    count_queries,
+    timer,
+)
+
+QUERY = QueryParams(weight_min=1, weight_max=1000, distance_min=0, distance_max=450)
+
+
+@pytest.mark.asyncio
+async def test_nearby_cars_backends(cargo_service, benchmark_data):
+    """Compares Python and SQL implementations of cargo list on the same data."""
+    with timer() as python_time:
+        python_list = await cargo_service._get_list_python(QUERY)
+    with timer() as sql_time:
+        sql_list = await cargo_service._get_list_sql(QUERY)
+
+    print(
+        f'\nget_list, {BENCHMARK_CARGOS} cargos x {BENCHMARK_CARS} cars: '
+        f'python {python_time["seconds"]:.3f}s, sql {sql_time["seconds"]:.3f}s'
+    )
+    python_counts = {cargo.id: cargo.nearby_cars_count for cargo in python_list}
+    sql_counts = {cargo.id: cargo.nearby_cars_count for cargo in sql_list}
+    assert python_counts.keys() == sql_counts.keys()
+    # SQL distances are spherical, so cars close to `distance_max` may be counted differently.
+    tolerance = max(2, BENCHMARK_CARS // 100)
+    assert all(abs(python_counts[key] - sql_counts[key]) <= tolerance for key in python_counts)
+
+
+@pytest.mark.asyncio
+async def test_fleet_snapshot(db_engine, cargo_service, benchmark_data):
+    """Compares reading the fleet per cargo with one fleet snapshot per request."""
+    cargos = await cargo_service.cargo_crud.read_all()
+    await cargo_service.coordinate_index.load(cargo_service.location_crud)
+
+    with count_queries(db_engine) as before_queries, timer() as before_time:
+        for _ in cargos:
+            cars = await cargo_service.car_crud.read_all()
+            cargo_service.coordinate_index.lookup([car.current_location for car in cars])
+    with count_queries(db_engine) as after_queries, timer() as after_time:
+        await cargo_service._get_list_python(QUERY)
+
+    print(
+        f'\nfleet per cargo: {before_queries["count"]} queries, {before_time["seconds"]:.3f}s; '
+        f'fleet snapshot: {after_queries["count"]} queries, {after_time["seconds"]:.3f}s'
+    )
+    assert before_queries['count'] == len(cargos)
+    assert after_queries['count'] == 2
@@ -1,4 +1,5 @@
 import asyncio
+from contextlib import asynccontextmanager
 
 import pytest_asyncio
 from httpx import AsyncClient
@@ -7,7 +8,7 @@ from sqlalchemy_utils import create_database, database_exists
 
 from cars_app.cache.settings import redis_client
 from cars_app.database.models import Base
-from cars_app.database.settings import get_session
+from cars_app.database.settings import get_session, get_session_factory
 from cars_app.main import app
 from config import DB_HOST, DB_PASS, DB_PORT, DB_USER, TEST_DB_NAME
 
@@ -60,5 +61,12 @@ async def session(db_engine):
 async def client(session):
     app.dependency_overrides[get_session] = lambda: session
 
+    @asynccontextmanager
+    async def session_factory():
+        # Data of test transaction is visible only to test session, which is closed by `session`.
+        yield session
+
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+
     async with AsyncClient(app=app, base_url='http://test') as client:
         yield client
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from cars_app.cache.codecs import get_codec
+from cars_app.cache.module import get_redis_cache
+from cars_app.cache.settings import EXPIRE_TIME, redis_client
+from cars_app.cache.singleflight import SingleFlight
+from cars_app.cache.tiered import LocalCache, TieredCache
+from cars_app.metrics.module import TIERED_CACHE_REQUESTS
+
+
+def tiered_cache_requests() -> dict[tuple[str, str], float]:
+    """Returns tiered cache reads counted so far by tier and result."""
+    return {
+        (sample.labels['tier'], sample.labels['result']): sample.value
+        for metric in TIERED_CACHE_REQUESTS.collect()
+        for sample in metric.samples
+        if sample.name.endswith('_total')
+    }
+
+
+@pytest_asyncio.fixture
+async def cache():
+    await redis_client.flushdb()
+    yield get_redis_cache()
+    await redis_client.flushdb()
+
+
+@pytest.mark.asyncio
+async def test_set_get(cache):
+    """Checks that cached value is returned."""
+    await cache.set('cargo-1', {'id': 1})
+    assert await cache.get('cargo-1') == {'id': 1}
+    assert await cache.get('cargo-2') is None
+
+
+@pytest.mark.asyncio
+async def test_set_expires(cache):
+    """Checks that versioned key expires even if no expire time is given."""
+    await cache.set('cargo-1', {'id': 1}, expire_time=None)
+    keys = await redis_client.keys('cargo:*')
+    assert len(keys) == 1
+    assert 0 < await redis_client.ttl(keys[0]) <= EXPIRE_TIME
+
+
+@pytest.mark.asyncio
+async def test_clear_key(cache):
+    """Checks that only given key is cleared."""
+    await cache.set('cargo-1', {'id': 1})
+    await cache.set('cargo-2', {'id': 2})
+    await cache.clear('cargo-1')
+    assert await cache.get('cargo-1') is None
+    assert await cache.get('cargo-2') == {'id': 2}
+
+
+@pytest.mark.asyncio
+async def test_clear_all(cache):
+    """Checks that clearing all keys bumps generation instead of deleting keys."""
+    await cache.set('cargo-1', {'id': 1})
+    await cache.clear('all')
+    assert await cache.get('cargo-1') is None
+    await cache.set('cargo-1', {'id': 2})
+    assert await cache.get('cargo-1') == {'id': 2}
+    assert await redis_client.get('generation:cargo') == b'1'
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache(cache):
+    """Checks that tiered cache serves local hits and drops them on invalidation from other worker."""
+    worker_1 = TieredCache(cache_client=redis_client)
+    worker_2 = TieredCache(cache_client=redis_client)
+    await worker_2.start()
+    await asyncio.sleep(0.1)
+
+    await worker_1.set('cargo-1', {'id': 1})
+    requests_before = tiered_cache_requests()
+    assert await worker_2.get('cargo-1') == {'id': 1}
+    assert await worker_2.get('cargo-1') == {'id': 1}
+    requests_after = tiered_cache_requests()
+    assert {
+        labels: count - requests_before.get(labels, 0)
+        for labels, count in requests_after.items()
+        if count != requests_before.get(labels, 0)
+    } == {('local', 'hit'): 1, ('local', 'miss'): 1, ('redis', 'hit'): 1}
+
+    await worker_1.clear('all')
+    await asyncio.sleep(0.1)
+    assert await worker_2.get('cargo-1') is None
+    assert await worker_1.get('cargo-1') is None
+    await worker_2.stop()
+
+
+def test_local_cache_limits():
+    """Checks that local cache evicts least recently used values over size limit and expired ones."""
+    local_cache = LocalCache(max_bytes=10, ttl=60)
+    local_cache.set('cargo-1', 1, size=4)
+    local_cache.set('cargo-2', 2, size=4)
+    local_cache.get('cargo-1')
+    local_cache.set('cargo-3', 3, size=4)
+    assert local_cache.get('cargo-2') is None
+    assert local_cache.get('cargo-1') == 1
+    local_cache.set('cargo-4', 4, size=1, ttl=0)
+    assert local_cache.get('cargo-4') is None
+
+
+@pytest.mark.parametrize('codec_name', ['json', 'orjson', 'msgpack'])
+def test_codecs(codec_name, cargo_data_1):
+    """Checks that codecs round trip pydantic models as plain data."""
+    pytest.importorskip(codec_name)
+    codec = get_codec(codec_name)
+    assert codec.loads(codec.dumps([cargo_data_1])) == [cargo_data_1.dict()]
+
+
+def test_unknown_codec():
+    """Checks that unknown codec is rejected."""
+    with pytest.raises(ValueError):
+        get_codec('pickle')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('with_lock', [False, True])
+async def test_single_flight(cache, with_lock):
+    """Checks that concurrent calls of the same key share one computation."""
+    single_flight = SingleFlight(cache_client=redis_client if with_lock else None)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return len(calls)
+
+    results = await asyncio.gather(*(single_flight.do('cargo-1', compute) for _ in range(10)))
+    assert results == [1] * 10
+    assert await single_flight.do('cargo-1', compute) == 2
+
+
+@pytest.mark.asyncio
+async def test_mark_stale(cache):
+    """Checks that marking values stale keeps them readable and bumps namespace version."""
+    await cache.set_raw('cargo-1', b'1')
+    assert await cache.get_versioned_raw('cargo-1') == (b'1', 0)
+    await cache.mark_stale('all')
+    assert await cache.get_versioned_raw('cargo-1') == (b'1', 1)
+    await cache.clear('all')
+    assert await cache.get_versioned_raw('cargo-1') == (None, 1)
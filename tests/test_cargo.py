@@ -1,14 +1,17 @@
+import json
 from http import HTTPStatus
 
 import pytest
 
 from cars_app.api.v1.routers.constants import (
+    CARGO_BATCH_FULL,
     CARGO_CREATE_FULL,
     CARGO_DELETE_FULL,
     CARGO_DETAIL_FULL,
     CARGO_LIST_FULL,
     CARGO_UPDATE_FULL,
 )
+from cars_app.exceptions.constants import MSG_CARGO_NOT_FOUND, MSG_LOCATION_NOT_FOUND
 from cars_app.validation.schemas import (
     CargoCarsInfo,
     CargoInfo,
@@ -55,6 +58,34 @@ async def test_get_list(client, fixture_cargo_1, fixture_cargo_2, fixture_cargo_
     ).dict()
 
 
+@pytest.mark.asyncio
+async def test_get_list_paginated(client, fixture_cargo_1, fixture_cargo_2, fixture_cargo_3):
+    """Checks keyset pagination of `cargo_list` endpoint."""
+    response = await client.get(CARGO_LIST_FULL, params={'limit': 2})
+    assert response.status_code == HTTPStatus.OK
+    assert [cargo['id'] for cargo in response.json()] == [fixture_cargo_1.id, fixture_cargo_2.id]
+    response = await client.get(
+        CARGO_LIST_FULL, params={'limit': 2, 'cursor': response.json()[-1]['id']},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [cargo['id'] for cargo in response.json()] == [fixture_cargo_3.id]
+
+
+@pytest.mark.asyncio
+async def test_get_list_ndjson(client, fixture_cargo_1, fixture_cargo_2, fixture_cargo_3):
+    """Checks NDJSON streaming response of `cargo_list` endpoint."""
+    response = await client.get(
+        CARGO_LIST_FULL,
+        params={'cursor': fixture_cargo_1.id},
+        headers={'Accept': 'application/x-ndjson'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    cargos = [json.loads(line) for line in response.text.splitlines()]
+    assert [cargo['id'] for cargo in cargos] == [fixture_cargo_2.id, fixture_cargo_3.id]
+    assert CargoListElement.validate(cargos[0])
+
+
 @pytest.mark.asyncio
 async def test_get_detail(client, fixture_cargo_1, fixture_car_1, fixture_car_2, fixture_car_3):
     """Checks normal response of `cargo_detail` endpoint."""
@@ -84,6 +115,22 @@ async def test_get_detail(client, fixture_cargo_1, fixture_car_1, fixture_car_2,
     ).dict()
 
 
+@pytest.mark.asyncio
+async def test_get_detail_nearest(client, fixture_cargo_1, fixture_car_1, fixture_car_2, fixture_car_3):
+    """Checks `limit` and `max_distance` of `cargo_detail` endpoint."""
+    url = CARGO_DETAIL_FULL.format(cargo_id=fixture_cargo_1.id)
+    response = await client.get(url, params={'limit': 2})
+    assert response.status_code == HTTPStatus.OK
+    assert [car['number_plate'] for car in response.json()['cars_info']] == [
+        fixture_car_1.number_plate, fixture_car_2.number_plate,
+    ]
+    response = await client.get(url, params={'max_distance': 10})
+    assert response.status_code == HTTPStatus.OK
+    assert [car['number_plate'] for car in response.json()['cars_info']] == [
+        fixture_car_1.number_plate,
+    ]
+
+
 @pytest.mark.asyncio
 async def test_create(client, cargo_data_1, fixture_location_1, fixture_location_2):
     """Checks normal response of `cargo_create` endpoint."""
@@ -121,3 +168,57 @@ async def test_delete(client, fixture_cargo_1):
     check_existance = await client.get(CARGO_DETAIL_FULL.format(cargo_id=fixture_cargo_1.id))
     assert response.status_code == HTTPStatus.NO_CONTENT
     assert check_existance.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_create_batch(client, cargo_data_1, cargo_data_3, fixture_location_1,
+                            fixture_location_2, fixture_location_3):
+    """Checks that `cargo_create_batch` endpoint reports result of each item."""
+    unknown_location = cargo_data_1.copy(update={'pickup_location': 99999})
+    response = await client.post(CARGO_BATCH_FULL, json=[
+        cargo_data_1.dict(), unknown_location.dict(), cargo_data_3.dict(),
+    ])
+    assert response.status_code == HTTPStatus.MULTI_STATUS
+    results = response.json()
+    assert [result['status_code'] for result in results] == [
+        HTTPStatus.CREATED, HTTPStatus.NOT_FOUND, HTTPStatus.CREATED,
+    ]
+    assert [result['index'] for result in results] == [0, 1, 2]
+    assert results[0]['cargo']['description'] == cargo_data_1.description
+    assert results[1]['detail'] == MSG_LOCATION_NOT_FOUND
+    assert results[2]['cargo']['description'] == cargo_data_3.description
+    assert results[0]['cargo']['id'] < results[2]['cargo']['id']
+
+
+@pytest.mark.asyncio
+async def test_update_batch(client, fixture_cargo_1, fixture_cargo_2, cargo_update_data):
+    """Checks that `cargo_update_batch` endpoint reports result of each item."""
+    response = await client.patch(CARGO_BATCH_FULL, json=[
+        {'id': fixture_cargo_1.id, **cargo_update_data.dict()},
+        {'id': 0, **cargo_update_data.dict()},
+        {'id': fixture_cargo_2.id, 'weight': 1, 'description': 'Light'},
+    ])
+    assert response.status_code == HTTPStatus.MULTI_STATUS
+    results = response.json()
+    assert [result['status_code'] for result in results] == [
+        HTTPStatus.OK, HTTPStatus.NOT_FOUND, HTTPStatus.OK,
+    ]
+    assert results[0]['cargo']['weight'] == cargo_update_data.weight
+    assert results[1]['detail'] == MSG_CARGO_NOT_FOUND
+    assert results[2]['cargo']['weight'] == 1
+    detail = await client.get(CARGO_DETAIL_FULL.format(cargo_id=fixture_cargo_2.id))
+    assert detail.json()['description'] == 'Light'
+
+
+@pytest.mark.asyncio
+async def test_delete_batch(client, fixture_cargo_1, fixture_cargo_2):
+    """Checks that `cargo_delete_batch` endpoint reports result of each item."""
+    response = await client.request('DELETE', CARGO_BATCH_FULL, json=[fixture_cargo_1.id, 0])
+    assert response.status_code == HTTPStatus.MULTI_STATUS
+    assert [result['status_code'] for result in response.json()] == [
+        HTTPStatus.NO_CONTENT, HTTPStatus.NOT_FOUND,
+    ]
+    deleted = await client.get(CARGO_DETAIL_FULL.format(cargo_id=fixture_cargo_1.id))
+    kept = await client.get(CARGO_DETAIL_FULL.format(cargo_id=fixture_cargo_2.id))
+    assert deleted.status_code == HTTPStatus.NOT_FOUND
+    assert kept.status_code == HTTPStatus.OK
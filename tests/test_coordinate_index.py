@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.geo.index import CoordinateIndex
+
+
+@pytest.fixture
+def coordinate_index(location_data_1, location_data_2, location_data_3):
+    index = CoordinateIndex()
+    locations = [location_data_3, location_data_1, location_data_2]
+    index.build(
+        [location.zip_code for location in locations],
+        [location.latitude for location in locations],
+        [location.longtitude for location in locations],
+    )
+    return index
+
+
+def test_lookup(coordinate_index, location_data_1, location_data_3):
+    """Checks that coordinates are returned in requested order."""
+    result = coordinate_index.lookup([location_data_3.zip_code, location_data_1.zip_code, location_data_3.zip_code])
+    np.testing.assert_array_equal(result, [
+        (location_data_3.latitude, location_data_3.longtitude),
+        (location_data_1.latitude, location_data_1.longtitude),
+        (location_data_3.latitude, location_data_3.longtitude),
+    ])
+    assert location_data_1.zip_code in coordinate_index
+    assert not coordinate_index.is_stale
+
+
+def test_lookup_unknown_zip(coordinate_index, location_data_1):
+    """Checks that unknown zip codes raise `KeyError`."""
+    assert 99999 not in coordinate_index
+    with pytest.raises(KeyError):
+        coordinate_index.lookup([location_data_1.zip_code, 99999])
+
+
+@pytest.mark.asyncio
+async def test_lookup_loaded(session, fixture_location_1, fixture_location_2,
+                             location_data_1, location_data_2, location_data_3):
+    """Checks that index is reloaded for zip codes missing from it at most once per interval."""
+    index = CoordinateIndex(reload_interval=60)
+    index.build([location_data_1.zip_code], [location_data_1.latitude], [location_data_1.longtitude])
+    location_crud = LocationCRUD(session)
+    result = await index.lookup_loaded([location_data_2.zip_code], location_crud)
+    np.testing.assert_array_equal(result, [(location_data_2.latitude, location_data_2.longtitude)])
+    await location_crud.create(location_data_3)
+    with pytest.raises(KeyError):
+        await index.lookup_loaded([location_data_3.zip_code], location_crud)
+    index.reload_interval = 0
+    result = await index.lookup_loaded([location_data_3.zip_code], location_crud)
+    np.testing.assert_array_equal(result, [(location_data_3.latitude, location_data_3.longtitude)])
+    with pytest.raises(KeyError):
+        await index.lookup_loaded([99999], location_crud)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from geopy.distance import distance
+
+from cars_app.geo.distance import (
+    ELLIPSOIDAL,
+    HAVERSINE,
+    distance_matrix,
+    distances_from,
+    nearest,
+)
+
+COORDINATES = [
+    (18.18027, -66.75266),
+    (18.36075, -67.17541),
+    (42.15525, -76.95148),
+    (61.21806, -149.90028),
+]
+
+
+def test_ellipsoidal_matches_geopy():
+    """Checks that vectorized ellipsoidal distances match `geopy` geodesic distances."""
+    result = distance_matrix(COORDINATES, COORDINATES, mode=ELLIPSOIDAL)
+    expected = [[distance(origin, destination).miles for destination in COORDINATES] for origin in COORDINATES]
+    assert result.shape == (len(COORDINATES), len(COORDINATES))
+    np.testing.assert_allclose(result, expected, atol=1e-4)
+
+
+def test_haversine_is_close_to_geopy():
+    """Checks that spherical distances stay within 0.5% of geodesic ones."""
+    result = distances_from(COORDINATES[0], COORDINATES[1:], mode=HAVERSINE)
+    expected = [distance(COORDINATES[0], destination).miles for destination in COORDINATES[1:]]
+    np.testing.assert_allclose(result, expected, rtol=5e-3)
+
+
+def test_unknown_mode():
+    """Checks that unknown distance mode is rejected."""
+    with pytest.raises(ValueError):
+        distance_matrix(COORDINATES, COORDINATES, mode='flat')
+
+
+def test_nearest():
+    """Checks selection of nearest distances with `limit` and `max_distance`."""
+    distances = np.array([5.0, 1.0, 7.0, 3.0, 1.0, 9.0])
+    assert nearest(distances).tolist() == [1, 4, 3, 0, 2, 5]
+    assert nearest(distances, limit=3).tolist()[2] == 3
+    assert sorted(nearest(distances, limit=2).tolist()) == [1, 4]
+    assert nearest(distances, max_distance=5.0).tolist() == [1, 4, 3, 0]
+    assert nearest(distances, limit=1, max_distance=0.5).tolist() == []
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from cars_app.geo.distance import distance_matrix
+from cars_app.geo.fleet import FleetSnapshot
+from cars_app.geo.sorted_distances import SortedDistanceCache
+from cars_app.geo.spatial import FleetIndex
+
+
+@pytest.fixture
+def fleet():
+    rng = np.random.default_rng(13)
+    coordinates = np.column_stack((rng.uniform(17, 65, 500), rng.uniform(-170, -65, 500)))
+    return np.arange(1, 501), coordinates
+
+
+@pytest.fixture
+def pickups():
+    rng = np.random.default_rng(17)
+    return np.column_stack((rng.uniform(17, 65, 50), rng.uniform(-170, -65, 50)))
+
+
+def brute_force_count(pickups, coordinates, distance_min, distance_max):
+    distances = distance_matrix(pickups, coordinates)
+    return np.count_nonzero((distances >= distance_min) & (distances <= distance_max), axis=1)
+
+
+@pytest.mark.parametrize('distance_min, distance_max', [(0, 450), (100, 900), (0, 0), (0, 20000)])
+def test_count_matches_full_scan(fleet, pickups, distance_min, distance_max):
+    """Checks that index counts are equal to full scan counts."""
+    car_ids, coordinates = fleet
+    index = FleetIndex()
+    index.sync(car_ids, coordinates)
+    np.testing.assert_array_equal(
+        index.count(pickups, distance_min, distance_max),
+        brute_force_count(pickups, coordinates, distance_min, distance_max),
+    )
+
+
+def test_sync_moved_cars(fleet, pickups):
+    """Checks that moved cars are re-bucketed without rebuilding index."""
+    car_ids, coordinates = fleet
+    index = FleetIndex()
+    index.sync(car_ids, coordinates)
+    moved = coordinates.copy()
+    moved[:100] = moved[100:200]
+    index.sync(car_ids[::-1], moved[::-1])
+    index.move(car_ids[-1], *pickups[0])
+    moved[-1] = pickups[0]
+    np.testing.assert_array_equal(index.count(pickups, 0, 450), brute_force_count(pickups, moved, 0, 450))
+    with pytest.raises(KeyError):
+        index.move(10000, *pickups[0])
+
+
+def test_sorted_distance_cache(fleet, pickups):
+    """Checks that cached sorted distances count cars like a full scan and follow fleet moves."""
+    car_ids, coordinates = fleet
+    zip_codes = np.arange(len(pickups))
+    cache = SortedDistanceCache()
+    snapshot = FleetSnapshot(car_ids, [''] * len(car_ids), car_ids, coordinates)
+    for distance_min, distance_max in [(0, 450), (100, 900), (0, 0)]:
+        np.testing.assert_array_equal(
+            cache.count(snapshot, zip_codes, pickups, distance_min, distance_max),
+            brute_force_count(pickups, coordinates, distance_min, distance_max),
+        )
+    assert len(cache) == len(pickups)
+
+    moved = coordinates[::-1].copy()
+    moved_snapshot = FleetSnapshot(car_ids, [''] * len(car_ids), car_ids, moved)
+    np.testing.assert_array_equal(
+        cache.count(moved_snapshot, zip_codes[:10], pickups[:10], 0, 450),
+        brute_force_count(pickups[:10], moved, 0, 450),
+    )
+    assert len(cache) == 10
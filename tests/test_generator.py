@@ -0,0 +1,34 @@
+import re
+
+import pytest
+
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.cargo import CargoCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.generator import DataGenerator
+
+
+@pytest.mark.asyncio
+async def test_generate(session):
+    """Checks that generated data is copied into database and respects constraints."""
+    car_crud, cargo_crud = CarCRUD(session), CargoCRUD(session)
+    generator = DataGenerator(LocationCRUD(session), car_crud, cargo_crud, seed=1, chunk_size=7)
+    zip_codes = await generator.generate_locations(10)
+    await generator.generate_cars(20, zip_codes)
+    await generator.generate_cargos(30, zip_codes)
+    cars = await car_crud.read_all()
+    cargos = await cargo_crud.read_all()
+    assert len(cars) == 20
+    assert len({car.number_plate for car in cars}) == 20
+    assert all(re.fullmatch('[1-9][0-9]{3}[A-Z]', car.number_plate) for car in cars)
+    assert len(cargos) == 30
+    assert all(cargo.pickup_location in zip_codes for cargo in cargos)
+    assert all(1 <= cargo.weight <= 1000 for cargo in cargos)
+
+
+@pytest.mark.asyncio
+async def test_generate_too_many_cars(session):
+    """Checks that cars count is limited."""
+    generator = DataGenerator(LocationCRUD(session), CarCRUD(session), CargoCRUD(session))
+    with pytest.raises(ValueError):
+        await generator.generate_cars(100_001, [])
@@ -0,0 +1,28 @@
+import pytest
+
+from cars_app.cache.tiered import get_cache
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.geo.index import CoordinateIndex
+from cars_app.services.helper import HelperService
+from cars_app.services.nearby_cars import get_nearby_cars_bucket_service
+
+
+@pytest.mark.asyncio
+async def test_update_locations_random(session, fixture_car_1, fixture_car_2, fixture_car_3):
+    """Checks that every car is moved to another existing location."""
+    car_crud = CarCRUD(session)
+    helper_service = HelperService(
+        LocationCRUD(session),
+        car_crud,
+        get_cache(),
+        CoordinateIndex(),
+        get_nearby_cars_bucket_service(session),
+    )
+    before = dict(await car_crud.read_locations())
+    await helper_service.update_locations_random()
+    after = dict(await car_crud.read_locations())
+    assert after.keys() == before.keys()
+    for car_id, zip_code in after.items():
+        assert zip_code != before[car_id]
+    assert await helper_service.location_crud.read_existing(list(after.values())) == set(after.values())
@@ -0,0 +1,25 @@
+import pytest
+
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.loader import LocationsLoader
+
+CSV_HEADER = '"zip","lat","lng","city","state_id","state_name"\n'
+CSV_ROWS = [
+    '"00601","18.18027","-66.75266","Adjuntas","PR","Puerto Rico"\n',
+    '"00602","18.36075","-67.17541","Aguada","PR","Puerto Rico"\n',
+    '"00603","18.45744","-67.12225","Aguadilla","PR","Puerto Rico"\n',
+]
+
+
+@pytest.mark.asyncio
+async def test_load_locations(session, tmp_path):
+    """Checks that locations are copied into database in chunks."""
+    path = tmp_path / 'uszips.csv'
+    path.write_text(CSV_HEADER + ''.join(CSV_ROWS), encoding='utf-8')
+    location_crud = LocationCRUD(session)
+    loaded = await LocationsLoader(location_crud, chunk_size=2).load(str(path))
+    assert loaded == len(CSV_ROWS)
+    location = await location_crud.read(602)
+    assert (location.city, location.state) == ('Aguada', 'Puerto Rico')
+    assert (location.latitude, location.longtitude) == (18.36075, -67.17541)
+    assert len(await location_crud.read_all()) == len(CSV_ROWS)
@@ -0,0 +1,21 @@
+from http import HTTPStatus
+
+import pytest
+
+from cars_app.api.v1.routers.constants import CARGO_LIST_FULL
+
+
+@pytest.mark.asyncio
+async def test_metrics(client):
+    """Checks that `/metrics` exposes request, SQL and cache metrics by route."""
+    await client.get(CARGO_LIST_FULL)
+    response = await client.get('/metrics')
+    assert response.status_code == HTTPStatus.OK
+    assert 'text/plain' in response.headers['content-type']
+    route = f'route="{CARGO_LIST_FULL}"'
+    assert any(
+        line.startswith('http_request_duration_seconds_count') and route in line
+        for line in response.text.splitlines()
+    )
+    assert 'http_request_sql_statements_count' in response.text
+    assert 'cache_requests_total{family="cargo",result="miss"}' in response.text
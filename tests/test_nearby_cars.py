@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from cars_app.cache.module import get_redis_cache
+from cars_app.cache.singleflight import get_single_flight
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.cargo import CargoCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.geo.buckets import count_at_edges
+from cars_app.geo.distance import distance_matrix
+from cars_app.geo.index import get_coordinate_index
+from cars_app.geo.sorted_distances import SortedDistanceCache
+from cars_app.geo.spatial import FleetIndex
+from cars_app.services import cargo as cargo_module
+from cars_app.services.cargo import CargoService
+from cars_app.services.nearby_cars import (
+    NEARBY_CARS_BACKEND_BUCKETS,
+    NearbyCarsBucketService,
+    get_nearby_cars_bucket_service,
+)
+from cars_app.validation.schemas import QueryParams
+
+
+def get_cargo_service(session, nearby_cars_buckets: NearbyCarsBucketService) -> CargoService:
+    """Returns `CargoService` instance bound to test session."""
+    return CargoService(
+        CargoCRUD(session),
+        CarCRUD(session),
+        LocationCRUD(session),
+        get_redis_cache(),
+        get_coordinate_index(),
+        FleetIndex(),
+        SortedDistanceCache(),
+        get_single_flight(),
+        nearby_cars_buckets,
+    )
+
+
+def test_count_at_edges():
+    """Checks that counts at edges match counts of computed distances."""
+    random = np.random.default_rng(0)
+    origins = np.column_stack((random.uniform(25, 49, 30), random.uniform(-124, -67, 30)))
+    destinations = np.column_stack((random.uniform(25, 49, 200), random.uniform(-124, -67, 200)))
+    edges = [0, 100, 450, 1000]
+    within, closer = count_at_edges(origins, destinations, edges)
+    distances = distance_matrix(origins, destinations)
+    for column, edge in enumerate(edges):
+        np.testing.assert_array_equal(within[:, column], (distances <= edge).sum(axis=1))
+        np.testing.assert_array_equal(closer[:, column], (distances < edge).sum(axis=1))
+
+
+@pytest.mark.asyncio
+async def test_get_list_buckets(session, fixture_cargo_1, fixture_cargo_2, fixture_cargo_3,
+                                fixture_car_1, fixture_car_2, fixture_car_3):
+    """Checks that list read from refreshed buckets matches list with computed counts."""
+    nearby_cars_buckets = get_nearby_cars_bucket_service(session)
+    cargo_service = get_cargo_service(session, nearby_cars_buckets)
+    query = QueryParams(distance_min=0, distance_max=450)
+    assert await cargo_service._get_list_buckets(query) is None
+    await nearby_cars_buckets.refresh()
+    cargos = await cargo_service._get_list_buckets(query)
+    assert cargos == await cargo_service._get_list_python(query)
+    assert await cargo_service._get_list_buckets(QueryParams(distance_min=0, distance_max=451)) is None
+
+
+@pytest.mark.asyncio
+async def test_add_locations(session, fixture_cargo_1, fixture_cargo_3, fixture_car_1):
+    """Checks that counts are added only for pickup locations without them."""
+    nearby_cars_buckets = get_nearby_cars_bucket_service(session)
+    bucket_crud = nearby_cars_buckets.bucket_crud
+    pickup_locations = [fixture_cargo_1.pickup_location, fixture_cargo_3.pickup_location]
+    await nearby_cars_buckets.add_locations(pickup_locations[:1])
+    assert await bucket_crud.read_zip_codes(pickup_locations) == set(pickup_locations[:1])
+    await nearby_cars_buckets.add_locations(pickup_locations)
+    assert await bucket_crud.read_zip_codes(pickup_locations) == set(pickup_locations)
+
+
+@pytest.mark.asyncio
+async def test_create_when_counts_fail(session, monkeypatch, cargo_data_1,
+                                       fixture_location_1, fixture_location_2):
+    """Checks that cargo is created and refresh is scheduled if adding counts fails."""
+    nearby_cars_buckets = get_nearby_cars_bucket_service(session)
+    cargo_service = get_cargo_service(session, nearby_cars_buckets)
+    refreshes = []
+
+    async def add_locations(zip_codes):
+        raise RuntimeError('counts failed')
+
+    monkeypatch.setattr(cargo_module, 'NEARBY_CARS_BACKEND', NEARBY_CARS_BACKEND_BUCKETS)
+    monkeypatch.setattr(cargo_module, 'schedule_refresh', refreshes.append)
+    monkeypatch.setattr(nearby_cars_buckets, 'add_locations', add_locations)
+    cargo = await cargo_service.create(cargo_data_1)
+    assert cargo.pickup_location == cargo_data_1.pickup_location
+    assert refreshes == [cargo_service.cache]
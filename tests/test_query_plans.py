@@ -0,0 +1,104 @@
+import json
+from contextlib import contextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select, text
+
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.cargo import CargoCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.database.generator import DataGenerator
+from cars_app.database.models import Cargo
+
+PLAN_LOCATIONS = 2000
+PLAN_CARS = 5000
+PLAN_CARGOS = 50000
+
+
+@contextmanager
+def capture_statements(engine):
+    """Yields list which gets `(statement, parameters)` of every executed SQL statement."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def get_seq_scans(plan: dict) -> set[str]:
+    """Returns relations read with sequential scan anywhere in plan tree."""
+    relations = {plan['Relation Name']} if plan['Node Type'] == 'Seq Scan' else set()
+    for subplan in plan.get('Plans', []):
+        relations |= get_seq_scans(subplan)
+    return relations
+
+
+async def get_middle_cargo_id(session) -> int:
+    """Returns id in the middle of seeded cargos, ids are not reset between tests."""
+    first_id = (await session.execute(select(func.min(Cargo.id)))).scalar()
+    return first_id + PLAN_CARGOS // 2
+
+
+async def explain(session, db_engine, crud_call) -> set[str]:
+    """Runs CRUD call and returns relations its last statement reads with sequential scan."""
+    with capture_statements(db_engine) as statements:
+        await crud_call
+    statement, parameters = statements[-1]
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+    plan = result.scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return get_seq_scans(plan[0]['Plan'])
+
+
+@pytest_asyncio.fixture
+async def seeded_session(session):
+    """Populates database with seeded data and refreshes planner statistics."""
+    generator = DataGenerator(LocationCRUD(session), CarCRUD(session), CargoCRUD(session), seed=7)
+    zip_codes = await generator.generate_locations(PLAN_LOCATIONS)
+    await generator.generate_cars(PLAN_CARS, zip_codes)
+    await generator.generate_cargos(PLAN_CARGOS, zip_codes)
+    await session.execute(text('ANALYZE location, car, cargo'))
+    return session
+
+
+@pytest.mark.asyncio
+async def test_cargo_weight_range_plan(seeded_session, db_engine):
+    """Checks that selective weight range of cargo list uses index."""
+    cargo_crud = CargoCRUD(seeded_session)
+    assert 'cargo' not in await explain(seeded_session, db_engine, cargo_crud.read_list(1, 10))
+    assert 'cargo' not in await explain(seeded_session, db_engine, cargo_crud.read_all(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_cargo_keyset_page_plan(seeded_session, db_engine):
+    """Checks that page of cargo list after cursor uses index."""
+    cargo_crud = CargoCRUD(seeded_session)
+    cargo_id = await get_middle_cargo_id(seeded_session)
+    page = cargo_crud.read_list(1, 1000, after_id=cargo_id, limit=100)
+    assert 'cargo' not in await explain(seeded_session, db_engine, page)
+
+
+@pytest.mark.asyncio
+async def test_cargo_nearby_cars_count_plan(seeded_session, db_engine):
+    """Checks that SQL nearby cars count reads only selected cargos and their pickup locations by index."""
+    cargo_crud = CargoCRUD(seeded_session)
+    seq_scans = await explain(
+        seeded_session, db_engine, cargo_crud.read_all_with_nearby_cars_count(1, 1000, limit=100),
+    )
+    assert 'cargo' not in seq_scans
+
+
+@pytest.mark.asyncio
+async def test_point_lookup_plans(seeded_session, db_engine):
+    """Checks that cargo and location lookups use primary keys."""
+    cargo_crud, location_crud = CargoCRUD(seeded_session), LocationCRUD(seeded_session)
+    cargo_id = await get_middle_cargo_id(seeded_session)
+    assert not await explain(seeded_session, db_engine, cargo_crud.read(cargo_id))
+    assert not await explain(seeded_session, db_engine, location_crud.read(100000))
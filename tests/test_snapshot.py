@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from cars_app.geo.index import CoordinateIndex
+from cars_app.geo.snapshot import LocationSnapshot, ensure_snapshot, is_snapshot_fresh
+
+CSV_CONTENT = (
+    '"zip","lat","lng","city","state_id","state_name"\n'
+    '"00603","18.45744","-67.12225","Aguadilla","PR","Puerto Rico"\n'
+    '"00601","18.18027","-66.75266","Adjuntas","PR","Puerto Rico"\n'
+    '"99501","61.21806","-149.90028","Anchorage","AK","Alaska"\n'
+)
+
+
+def test_snapshot(tmp_path):
+    """Checks conversion of CSV file into memory-mapped snapshot sorted by zip code."""
+    path, directory = tmp_path / 'uszips.csv', str(tmp_path / 'uszips.snapshot')
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    assert not is_snapshot_fresh(str(path), directory)
+    snapshot = ensure_snapshot(str(path), directory)
+    assert is_snapshot_fresh(str(path), directory)
+    assert isinstance(snapshot.zip_codes, np.memmap)
+    assert snapshot.records() == [
+        (601, 'Adjuntas', 'Puerto Rico', 18.18027, -66.75266),
+        (603, 'Aguadilla', 'Puerto Rico', 18.45744, -67.12225),
+        (99501, 'Anchorage', 'Alaska', 61.21806, -149.90028),
+    ]
+    assert snapshot.states.tolist() == ['Alaska', 'Puerto Rico']
+    assert snapshot.records(1, 2) == LocationSnapshot.load(directory).records(1, 2)
+
+
+def test_concurrent_snapshot(tmp_path):
+    """Checks that workers building missing snapshot together all load the same one."""
+    path, directory = tmp_path / 'uszips.csv', str(tmp_path / 'uszips.snapshot')
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        snapshots = list(executor.map(lambda _: ensure_snapshot(str(path), directory), range(8)))
+    assert all(snapshot.records() == snapshots[0].records() for snapshot in snapshots)
+    assert len(snapshots[0]) == 3
+
+
+def test_coordinate_index_from_snapshot(tmp_path):
+    """Checks that coordinate index resolves zip codes from snapshot columns."""
+    path, directory = tmp_path / 'uszips.csv', str(tmp_path / 'uszips.snapshot')
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    index = CoordinateIndex()
+    index.load_snapshot(ensure_snapshot(str(path), directory))
+    assert not index.is_stale
+    np.testing.assert_array_equal(index.lookup([99501, 601]), [
+        (61.21806, -149.90028),
+        (18.18027, -66.75266),
+    ])
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+from cars_app.api.v1.routers.constants import CAR_TELEMETRY_FULL
+from cars_app.cache.tiered import get_cache
+from cars_app.database.crud.car import CarCRUD
+from cars_app.database.crud.location import LocationCRUD
+from cars_app.main import app
+from cars_app.services.telemetry import (
+    TelemetryBuffer,
+    TelemetryService,
+    get_telemetry_buffer,
+)
+from cars_app.validation.schemas import CarUpdateBulk
+
+
+def test_buffer_coalesces_updates():
+    """Checks that buffer keeps only the latest location of each car."""
+    buffer = TelemetryBuffer(max_size=2)
+    assert buffer.add([CarUpdateBulk(id=1, current_location=601)]) == 0
+    assert buffer.add([
+        CarUpdateBulk(id=1, current_location=602),
+        CarUpdateBulk(id=2, current_location=603),
+        CarUpdateBulk(id=1, current_location=603),
+    ]) == 2
+    assert buffer.drain() == {1: 603, 2: 603}
+    assert len(buffer) == 0
+
+
+def test_buffer_rejects_new_cars_when_full():
+    """Checks that full buffer rejects whole batch with new cars but accepts known ones."""
+    buffer = TelemetryBuffer(max_size=1)
+    assert buffer.add([CarUpdateBulk(id=1, current_location=601)]) == 0
+    assert buffer.add([
+        CarUpdateBulk(id=1, current_location=602),
+        CarUpdateBulk(id=2, current_location=602),
+    ]) is None
+    assert buffer.add([CarUpdateBulk(id=1, current_location=603)]) == 1
+    assert buffer.drain() == {1: 603}
+
+
+@pytest.mark.asyncio
+async def test_flush(session, fixture_car_1, fixture_car_2, fixture_location_3, location_data_3):
+    """Checks that buffered locations are written only on flush."""
+    car_crud = CarCRUD(session)
+    telemetry_service = TelemetryService(
+        car_crud, LocationCRUD(session), get_cache(), TelemetryBuffer(),
+    )
+    before = dict(await car_crud.read_locations())
+    await telemetry_service.ingest([
+        CarUpdateBulk(id=fixture_car_1.id, current_location=fixture_car_2.current_location),
+        CarUpdateBulk(id=fixture_car_1.id, current_location=location_data_3.zip_code),
+    ])
+    assert dict(await car_crud.read_locations()) == before
+    assert await telemetry_service.flush() == 1
+    after = dict(await car_crud.read_locations())
+    assert after[fixture_car_1.id] == location_data_3.zip_code
+    assert after[fixture_car_2.id] == before[fixture_car_2.id]
+    assert await telemetry_service.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_telemetry(client, fixture_car_1, fixture_location_2, location_data_2):
+    """Checks responses of `car_telemetry` endpoint with free, full buffer and unknown location."""
+    buffer = TelemetryBuffer(max_size=1)
+    app.dependency_overrides[get_telemetry_buffer] = lambda: buffer
+    try:
+        update = {'id': fixture_car_1.id, 'current_location': location_data_2.zip_code}
+        response = await client.post(CAR_TELEMETRY_FULL, json=[update])
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.json() == {'accepted': 1, 'buffered': 1}
+        response = await client.post(CAR_TELEMETRY_FULL, json=[{**update, 'id': 0}])
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert response.headers['Retry-After']
+        response = await client.post(CAR_TELEMETRY_FULL, json=[{**update, 'current_location': 0}])
+        assert response.status_code == HTTPStatus.NOT_FOUND
+    finally:
+        del app.dependency_overrides[get_telemetry_buffer]
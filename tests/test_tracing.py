@@ -0,0 +1,26 @@
+import pytest
+
+from cars_app.api.v1.routers.constants import CARGO_LIST_FULL
+from cars_app.tracing.module import TRACING_EXPORTER_MEMORY, configure_tracing
+
+
+@pytest.fixture
+def span_exporter():
+    exporter = configure_tracing(TRACING_EXPORTER_MEMORY)
+    exporter.clear()
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_request_spans(client, span_exporter, fixture_cargo_1, fixture_cargo_2):
+    """Checks that request is traced through router, service, CRUD and cache layers."""
+    await client.get(CARGO_LIST_FULL)
+    spans = {span.name: span for span in span_exporter.get_finished_spans()}
+    assert f'GET {CARGO_LIST_FULL}' in spans
+    assert 'cargo_list' in spans
+    assert 'CargoService.get_list' in spans
+    assert spans['CargoCRUD.read_list'].attributes['rows'] == 2
+    assert spans['RedisCache.get'].attributes['cache.family'] == 'cargo'
+    assert spans['RedisCache.get'].attributes['cache.result'] == 'miss'
+    root = spans[f'GET {CARGO_LIST_FULL}']
+    assert spans['CargoCRUD.read_list'].context.trace_id == root.context.trace_id